@@ -0,0 +1,157 @@
+"""
+Shared client, cached lookups and runners for the test scripts
+"""
+import asyncio
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+try:
+    from orjson import OPT_INDENT_2, dumps as json_dumps, loads as json_loads
+
+    def pretty_json(obj) -> str:
+        return json_dumps(obj, option=OPT_INDENT_2).decode()
+except ImportError:
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+    json_loads = json.loads
+
+    def pretty_json(obj) -> str:
+        return json.dumps(obj, indent=2)
+
+BASE_URL = "http://localhost:8000"
+# Keep idle connections to the test server open between the scripts' bursts of requests
+CLIENT_LIMITS = httpx.Limits(max_connections=8, max_keepalive_connections=8, keepalive_expiry=30.0)
+# Failed connection attempts are retried on the transport before a request gives up
+CONNECT_RETRIES = 2
+# One keep-alive client shared by every request in the test run
+SESSION = httpx.Client(
+    base_url=BASE_URL,
+    timeout=60.0,
+    transport=httpx.HTTPTransport(http2=True, limits=CLIENT_LIMITS, retries=CONNECT_RETRIES),
+)
+atexit.register(SESSION.close)
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def cached(ttl):
+    """Reuse a zero-argument fetch's result for ttl seconds"""
+    def decorator(fetch):
+        entry = []
+
+        @functools.wraps(fetch)
+        def wrapper():
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            value = fetch()
+            entry[:] = [time.monotonic() + ttl, value]
+            return value
+
+        wrapper.cache_clear = entry.clear
+        return wrapper
+    return decorator
+
+
+def is_interactive():
+    """True when a person is at the terminal; CI runs and piped stdin skip prompts"""
+    return sys.stdin.isatty() and not os.environ.get("CI")
+
+
+def async_client():
+    """AsyncClient for concurrent bursts; HTTP/2 multiplexes them over one connection"""
+    return httpx.AsyncClient(base_url=BASE_URL, http2=True, timeout=60.0, limits=CLIENT_LIMITS)
+
+
+def stream_to_file(filename, method, url, **kwargs):
+    """Send a request and stream a 200 body straight into filename
+
+    Other bodies are read into memory so callers can still report response.text.
+    """
+    with SESSION.stream(method, url, **kwargs) as response:
+        if response.status_code == 200:
+            with open(filename, 'wb') as f:
+                for chunk in response.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+        else:
+            response.read()
+    return response
+
+
+def response_json(response):
+    """Decode a response body, with orjson when it is installed"""
+    return json_loads(response.content)
+
+
+async def astream_to_file(client, filename, method, url, **kwargs):
+    """stream_to_file for an AsyncClient; the file writes run on worker threads"""
+    async with client.stream(method, url, **kwargs) as response:
+        if response.status_code == 200:
+            f = await asyncio.to_thread(open, filename, 'wb')
+            try:
+                async for chunk in response.aiter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    await asyncio.to_thread(f.write, chunk)
+            finally:
+                await asyncio.to_thread(f.close)
+        else:
+            await response.aread()
+    return response
+
+
+@cached(ttl=10)
+def get_health():
+    """GET /health; short TTL because service status can change"""
+    return SESSION.get("/health")
+
+
+@cached(ttl=60)
+def get_templates():
+    """GET /templates; the template list is fixed for a server's lifetime"""
+    return SESSION.get("/templates")
+
+
+_check_log = threading.local()
+
+
+def log(*args, sep=' '):
+    """print() for checks: collected per worker under run_concurrently, printed directly otherwise"""
+    lines = getattr(_check_log, 'lines', None)
+    if lines is None:
+        print(*args, sep=sep, flush=True)
+    else:
+        lines.append(sep.join(str(arg) for arg in args))
+
+
+def _run_check(test_name, test_func):
+    """Run one check, returning whether it passed (raised nothing) and the lines it logged"""
+    _check_log.lines = lines = []
+    try:
+        try:
+            test_func()
+            result = True
+        except AssertionError as e:
+            log(f"❌ {test_name} failed: {e}")
+            result = False
+        except Exception as e:
+            log(f"❌ {test_name} failed with exception: {e}")
+            result = False
+        return result, lines
+    finally:
+        del _check_log.lines
+
+
+def run_concurrently(tests, max_workers):
+    """Run independent (name, func) checks on a thread pool
+
+    Returns (name, result, logged lines) per check, in the order given.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_run_check, test_name, test_func) for test_name, test_func in tests]
+    return [(test_name, *future.result()) for (test_name, _), future in zip(tests, futures)]
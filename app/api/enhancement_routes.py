@@ -1,9 +1,9 @@
 """
 Query Enhancement Management API Routes
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import os
 
 # Import our modular enhancement service
@@ -12,7 +12,8 @@ try:
         EnhancementStrategy, 
         configure_enhancement, 
         get_enhancement_strategy,
-        enhance_search_query
+        enhance_search_query,
+        pre_enhance_queries
     )
     ENHANCEMENT_AVAILABLE = True
 except ImportError:
@@ -34,7 +35,13 @@ class QueryEnhanceResponse(BaseModel):
 
 
 class StrategyConfigRequest(BaseModel):
-    strategy: str  # none, openai, anthropic, local_llm, custom_api
+    strategy: str  # none, openai, openai_batched, anthropic, local_llm, custom_api
+
+
+class PreEnhanceRequest(BaseModel):
+    queries: List[str]
+    strategy: str = "openai"  # cache to fill: openai or openai_batched
+    context: Optional[Dict[str, Any]] = None
 
 
 class StrategyStatusResponse(BaseModel):
@@ -157,6 +164,36 @@ async def test_enhancement_strategy(strategy: str, query: str = "Python develope
         )
 
 
+@router.post("/pre-enhance")
+async def pre_enhance_endpoint(request: PreEnhanceRequest, background_tasks: BackgroundTasks):
+    """
+    Queue an offline job that enhances queries through the OpenAI Batch API (half the cost,
+    results within 24h) and fills the given strategy's cache for later searches
+    """
+    if not ENHANCEMENT_AVAILABLE:
+        raise HTTPException(
+            status_code=503,
+            detail="Query enhancement service not available"
+        )
+    
+    try:
+        strategy = EnhancementStrategy(request.strategy)
+    except ValueError:
+        strategy = None
+    if strategy not in (EnhancementStrategy.OPENAI, EnhancementStrategy.OPENAI_BATCHED):
+        raise HTTPException(
+            status_code=400,
+            detail="Pre-enhancement fills the openai or openai_batched cache only"
+        )
+    
+    background_tasks.add_task(pre_enhance_queries, request.queries, strategy, request.context)
+    return {
+        "message": f"Pre-enhancement of {len(request.queries)} queries queued",
+        "strategy": strategy.value,
+        "success": True
+    }
+
+
 @router.get("/strategies")
 async def list_available_strategies():
     """List all available enhancement strategies with descriptions"""
@@ -171,6 +208,11 @@ async def list_available_strategies():
             "requirements": "OPENAI_API_KEY environment variable",
             "performance": "~1-2 seconds per query"
         },
+        "openai_batched": {
+            "description": "OpenAI enhancement with concurrent queries coalesced into one API call",
+            "requirements": "OPENAI_API_KEY environment variable",
+            "performance": "~1-2 seconds per batch (+25ms batching window)"
+        },
         "anthropic": {
             "description": "Anthropic Claude-based query enhancement",
             "requirements": "ANTHROPIC_API_KEY environment variable",
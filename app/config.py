@@ -35,7 +35,7 @@ class Settings(BaseSettings):
     job_roles: str = "Backend,Frontend,Database,QA,Fullstack,DevOps,Mobile,DataScience"
     
     # Query Enhancement Settings
-    query_enhancement_strategy: str = "none"  # none, openai, anthropic, local_llm, custom_api
+    query_enhancement_strategy: str = "none"  # none, openai, openai_batched, anthropic, local_llm, custom_api
     openai_api_key: str = ""
     anthropic_api_key: str = ""
     custom_enhancer_url: str = ""
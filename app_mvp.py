@@ -3,27 +3,44 @@
 MVP version of Resume Upload System
 - upload_profile: Upload single/multiple/zipped files to MinIO with category organization
 """
+import asyncio
+import atexit
+import heapq
 import httpx
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request
 from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
-from typing import List, Optional
+from typing import IO, List, Optional
 import logging
 import os
+import queue
+import re
 import zipfile
 import tempfile
 import shutil
 from datetime import datetime
 from contextlib import asynccontextmanager
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+
+# Configure logging: handlers run on a listener thread, so request paths only enqueue records
+_log_queue = queue.SimpleQueue()
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+_log_listener = QueueListener(_log_queue, _log_handler, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
+BUCKET_NAME_UNSAFE = re.compile(r'[^a-zA-Z0-9]')
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting Resume Upload System")
+    from services.storage_service import STORAGE_IO_WORKERS
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=STORAGE_IO_WORKERS))
     try:
         await initialize_services()
         logger.info("All services initialized successfully")
@@ -31,11 +48,23 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize services: {e}")
     yield
     logger.info("Shutting down Resume Upload System")
+    from services.http_clients import close_llm_client, close_qdrant_client
+    await close_llm_client()
+    await close_qdrant_client()
 
 async def initialize_services():
-    from services.storage_service import storage_service
+    from services.storage_service import get_storage_service
+    storage_service = get_storage_service()
+    from services.http_clients import get_llm_client
+    app.state.llm_client = get_llm_client()
+    from services.vector_service import vector_service
     default_bucket = "rawresumes"
-    await storage_service.create_bucket_if_not_exists(default_bucket)
+    # MinIO and Qdrant setup and model warmup are independent; run them together so startup waits for the slowest
+    await asyncio.gather(
+        storage_service.create_bucket_if_not_exists(default_bucket),
+        vector_service.initialize_collections(),
+        vector_service.warmup(),
+    )
     logger.info(f"Default bucket ready: {default_bucket}")
 
 # FastAPI app init
@@ -97,15 +126,15 @@ async def root():
     }
 
 async def determine_bucket_name(job_category: Optional[str], use_existing_bucket: bool) -> dict:
-    from services.storage_service import storage_service
+    from services.storage_service import get_storage_service
+    storage_service = get_storage_service()
     if not job_category:
         return {
             "bucket_name": "rawresumes",
             "status": "using_default_bucket",
             "message": "No category specified, using default bucket"
         }
-    import re
-    clean_category = re.sub(r'[^a-zA-Z0-9]', '', job_category.lower())
+    clean_category = BUCKET_NAME_UNSAFE.sub('', job_category.lower())
     base_bucket_name = f"resumes-{clean_category}"
     try:
         bucket_exists = await storage_service.bucket_exists(base_bucket_name)
@@ -153,7 +182,8 @@ async def upload_profile(
 ):
     try:
         logger.info(f"Upload request - Files: {[f.filename for f in files]}, Category: {job_category}")
-        from services.storage_service import storage_service
+        from services.storage_service import get_storage_service
+        storage_service = get_storage_service()
         bucket_info = await determine_bucket_name(job_category, use_existing_bucket)
         bucket_name = bucket_info["bucket_name"]
         logger.info(f"Using bucket: {bucket_name} ({bucket_info['status']})")
@@ -229,8 +259,7 @@ async def process_zip_file_raw(zip_file: UploadFile, bucket_name: str):
     uploaded, rejected, total_processed = [], [], 0
     try:
         with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as temp_zip:
-            content = await zip_file.read()
-            temp_zip.write(content)
+            await asyncio.to_thread(shutil.copyfileobj, zip_file.file, temp_zip)
             temp_zip_path = temp_zip.name
         with zipfile.ZipFile(temp_zip_path, 'r') as zip_ref:
             extract_dir = tempfile.mkdtemp()
@@ -248,20 +277,21 @@ async def process_zip_file_raw(zip_file: UploadFile, bucket_name: str):
                         })
                         continue
                     try:
-                        with open(file_path, 'rb') as f:
-                            file_content = f.read()
-                        if len(file_content) > 10485760:
+                        file_size = os.path.getsize(file_path)
+                        if file_size > 10485760:
                             rejected.append({
                                 "filename": filename,
                                 "reason": "File size exceeds 10MB limit",
-                                "file_size_mb": round(len(file_content) / 1048576, 2)
+                                "file_size_mb": round(file_size / 1048576, 2)
                             })
                             continue
-                        result = await upload_file_to_bucket(
-                            filename=filename,
-                            content=file_content,
-                            bucket_name=bucket_name
-                        )
+                        with open(file_path, 'rb') as f:
+                            result = await upload_file_to_bucket(
+                                filename=filename,
+                                data=f,
+                                length=file_size,
+                                bucket_name=bucket_name
+                            )
                         if result["success"]:
                             uploaded.append(result["file_info"])
                         else:
@@ -294,10 +324,10 @@ async def process_single_file_raw(file: UploadFile, bucket_name: str):
                 "success": False,
                 "error": "Unsupported file format."
             }
-        content = await file.read()
         return await upload_file_to_bucket(
             filename=file.filename,
-            content=content,
+            data=file.file,
+            length=file.size if file.size is not None else -1,
             bucket_name=bucket_name
         )
     except Exception as e:
@@ -306,9 +336,10 @@ async def process_single_file_raw(file: UploadFile, bucket_name: str):
             "error": f"File processing error: {str(e)}"
         }
 
-async def upload_file_to_bucket(filename: str, content: bytes, bucket_name: str):
+async def upload_file_to_bucket(filename: str, data: IO[bytes], length: int, bucket_name: str):
     try:
-        from services.storage_service import storage_service
+        from services.storage_service import get_storage_service
+        storage_service = get_storage_service()
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")[:-3]
         file_extension = filename.split('.')[-1].lower()
         base_name = '.'.join(filename.split('.')[:-1])
@@ -316,8 +347,12 @@ async def upload_file_to_bucket(filename: str, content: bytes, bucket_name: str)
         minio_path = await storage_service.upload_file(
             bucket_name=bucket_name,
             object_name=unique_filename,
-            file_content=content
+            data=data,
+            length=length
         )
+        if length < 0:
+            # Unknown-size streams are read to EOF by the multipart upload, so the position is the size
+            length = data.tell()
         logger.info(f"File uploaded to bucket {bucket_name}: {minio_path}")
         return {
             "success": True,
@@ -326,8 +361,8 @@ async def upload_file_to_bucket(filename: str, content: bytes, bucket_name: str)
                 "unique_filename": unique_filename,
                 "minio_path": minio_path,
                 "bucket_name": bucket_name,
-                "file_size_bytes": len(content),
-                "file_size_mb": round(len(content) / 1048576, 2),
+                "file_size_bytes": length,
+                "file_size_mb": round(length / 1048576, 2),
                 "upload_timestamp": datetime.utcnow().isoformat(),
                 "status": f"uploaded_to_bucket_{bucket_name}"
             }
@@ -354,8 +389,7 @@ async def search_profile(
         logger.info(f"Search request: query='{query}', category='{job_category}', limit={limit}, threshold={similarity_threshold}")
         
         # Initialize vector service
-        from services.vector_service import VectorService
-        vector_service = VectorService()
+        from services.vector_service import vector_service
         
         # Perform vector similarity search
         results = await vector_service.search_resumes(
@@ -384,6 +418,22 @@ async def search_profile(
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 
+@app.get("/resume_text/{resume_id}")
+async def get_resume_text(resume_id: str):
+    """
+    Full extracted text of one resume from search results (fetched on demand, e.g. when a card is expanded)
+    """
+    from services.vector_service import vector_service
+    try:
+        text = await vector_service.get_text_by_id(resume_id)
+    except Exception as e:
+        logger.error(f"Resume text error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch resume text: {str(e)}")
+    if text is None:
+        raise HTTPException(status_code=404, detail=f"Resume with ID {resume_id} not found")
+    return {"id": resume_id, "text": text}
+
+
 @app.post("/download_selected_resumes")
 async def download_selected_resumes(
     resume_ids: str = Form(..., description="Comma-separated list of resume IDs from search results"),
@@ -395,7 +445,7 @@ async def download_selected_resumes(
     """
     try:
         from services.document_template_service import document_template_service
-        from services.vector_service import VectorService
+        from services.vector_service import vector_service
         
         logger.info(f"Download request: resume_ids='{resume_ids}', template='{template}'")
         
@@ -406,8 +456,6 @@ async def download_selected_resumes(
         
         logger.info(f"Processing {len(id_list)} resume IDs: {id_list}")
         
-        # Initialize vector service to get resume data
-        vector_service = VectorService()
         
         # Get resume data for each ID
         selected_resumes = []
@@ -457,7 +505,7 @@ async def download_selected_resumes(
 
 
         # Generate Word document
-        doc_bytes = document_template_service.generate_resume_document(
+        doc_bytes = await document_template_service.generate_resume_document_async(
             resumes=selected_resumes,
             template_name=template
         )
@@ -499,12 +547,10 @@ async def download_search_results(
     """
     try:
         from services.document_template_service import document_template_service
-        from services.vector_service import VectorService
+        from services.vector_service import vector_service
         
         logger.info(f"Download search results: query='{query}', template='{template}'")
         
-        # Initialize vector service
-        vector_service = VectorService()
         
         # Perform search to get results
         search_results = await vector_service.search_resumes(
@@ -533,7 +579,7 @@ async def download_search_results(
             r["override_phone"] = "9876543210"
 
         # Generate Word document
-        doc_bytes = document_template_service.generate_resume_document(
+        doc_bytes = await document_template_service.generate_resume_document_async(
             resumes=search_results,
             template_name=template
         )
@@ -597,15 +643,13 @@ async def download_single_resume(
     """
     try:
         from services.document_template_service import document_template_service
-        from services.vector_service import VectorService
+        from services.vector_service import vector_service
         
         logger.info(f"Single resume download request: resume_id='{resume_id}', template='{template}'")
         
         if not resume_id.strip():
             raise HTTPException(status_code=400, detail="Resume ID is required")
         
-        # Initialize vector service to get resume data
-        vector_service = VectorService()
         
         # Search for specific resume by ID
         search_results = await vector_service.search_resumes(
@@ -639,7 +683,7 @@ async def download_single_resume(
             r["override_phone"] = "9876543210"
 
         # Generate Word document for single resume
-        doc_bytes = document_template_service.generate_resume_document(
+        doc_bytes = await document_template_service.generate_resume_document_async(
             resumes=[matching_resume],
             template_name=template
         )
@@ -671,14 +715,16 @@ async def download_single_resume(
 @app.get("/health")
 async def health_check():
     try:
-        from services.storage_service import storage_service
-        from services.vector_service import VectorService
+        from services.storage_service import get_storage_service
+        storage_service = get_storage_service()
+        from services.vector_service import vector_service
         
-        minio_status = await storage_service.health_check()
-        
-        # Check vector service
-        vector_service = VectorService()
-        qdrant_status = await vector_service.health_check()
+        # Probe MinIO and Qdrant concurrently; a probe that raises counts as unhealthy
+        minio_status, qdrant_status = await asyncio.gather(
+            storage_service.health_check(), vector_service.health_check(), return_exceptions=True
+        )
+        minio_status = minio_status is True
+        qdrant_status = qdrant_status is True
         
         # Check if embedding model is available
         embedding_model_status = "available"
@@ -714,20 +760,29 @@ async def health_check():
 @app.get("/debug/buckets")
 async def debug_buckets():
     try:
-        from services.storage_service import storage_service
+        from services.storage_service import get_storage_service
+        storage_service = get_storage_service()
         all_buckets = await storage_service.list_all_buckets()
         bucket_status = {}
         total_files = 0
         for bucket_name in all_buckets:
             try:
-                files = await storage_service.list_files(bucket_name)
+                file_count, first_files, recent_files = 0, [], []
+                async for name in storage_service.iter_files(bucket_name):
+                    file_count += 1
+                    if len(first_files) < 10:
+                        first_files.append(name)
+                    if len(recent_files) < 5:
+                        heapq.heappush(recent_files, name)
+                    else:
+                        heapq.heappushpop(recent_files, name)
                 bucket_status[bucket_name] = {
                     "exists": True,
-                    "file_count": len(files),
-                    "files": files[:10] if files else [],
-                    "recent_files": sorted(files, reverse=True)[:5] if files else []
+                    "file_count": file_count,
+                    "files": first_files,
+                    "recent_files": sorted(recent_files, reverse=True)
                 }
-                total_files += len(files)
+                total_files += file_count
             except Exception as e:
                 bucket_status[bucket_name] = {
                     "exists": False,
@@ -746,8 +801,7 @@ async def debug_buckets():
 async def debug_vector():
     """Debug vector service status"""
     try:
-        from services.vector_service import VectorService
-        vector_service = VectorService()
+        from services.vector_service import vector_service
         
         # Get collection info
         collection_info = await vector_service.get_collection_info()
@@ -0,0 +1,16 @@
+"""
+pytest fixtures shared by the test scripts
+"""
+import httpx
+import pytest
+
+from _test_utils import BASE_URL, SESSION
+
+
+@pytest.fixture(scope="session")
+def api_server():
+    """Skip tests that need the API server when nothing is listening at BASE_URL"""
+    try:
+        SESSION.get("/health", timeout=5.0)
+    except httpx.TransportError as e:
+        pytest.skip(f"API server not reachable at {BASE_URL}: {e}")
@@ -230,7 +230,7 @@ def search_resumes():
             result = response.json()
             print(f"✓ Search completed - found {len(result.get('results', []))} matches")
             
-            for i, match in enumerate(result.get('results', [])[:3):
+            for i, match in enumerate(result.get('results', [])[:3]):
                 resume = match.get('resume', {})
                 print(f"  {i+1}. {resume.get('candidate_name', 'Unknown')} - Score: {match.get('similarity_score', 0):.3f}")
                 print(f"     Skills: {resume.get('skills', [])}")
@@ -249,7 +249,11 @@ def wait_for_processing(max_wait=60):
     """Wait for resumes to be processed"""
     print(f"Waiting for resume processing to complete (max {max_wait}s)...")
     
-    for i in range(max_wait):
+    # Poll quickly at first and back off to the old 2s cadence, so a fast
+    # finish is noticed early without hammering the API on a slow one
+    delay = 0.1
+    deadline = time.monotonic() + max_wait
+    while time.monotonic() < deadline:
         try:
             response = requests.get(f"{BASE_URL}/resumes/stats/overview", timeout=5)
             if response.status_code == 200:
@@ -266,8 +270,8 @@ def wait_for_processing(max_wait=60):
         except requests.exceptions.RequestException:
             pass
         
-        if i < max_wait - 1:
-            time.sleep(2)
+        time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+        delay = min(delay * 1.6, 2.0)
     
     print(f"⚠ Processing may still be ongoing after {max_wait}s")
     return False
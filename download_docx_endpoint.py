@@ -38,7 +38,7 @@ async def download_resume_as_docx(
         resume_data = request.get("resume_data", {})
         
         # Generate document
-        doc_bytes = document_template_service.generate_resume_document(
+        doc_bytes = await document_template_service.generate_resume_document_async(
             resumes=[resume_data],
             template_name=template
         )
@@ -0,0 +1,21 @@
+"""
+Micro-batching Helpers
+Shared by the queue-draining loops that coalesce concurrent requests into one call
+"""
+import asyncio
+
+
+async def drain_batch(queue: asyncio.Queue, max_size: int, max_wait: float) -> list:
+    """Wait for one queued item, then collect more until max_size items or max_wait seconds"""
+    loop = asyncio.get_running_loop()
+    batch = [await queue.get()]
+    deadline = loop.time() + max_wait
+    while len(batch) < max_size:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(queue.get(), remaining))
+        except asyncio.TimeoutError:
+            break
+    return batch
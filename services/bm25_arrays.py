@@ -0,0 +1,108 @@
+"""
+BM25 Arrays
+Struct-of-arrays BM25 model persisted as an uncompressed .npz and memory-mapped on load
+"""
+import struct
+import zipfile
+from typing import Dict, List
+
+import numpy as np
+
+# Local file header: signature(4) + fixed fields(22) + name length(2) + extra length(2)
+_LOCAL_HEADER_SIZE = 30
+
+
+def save_bm25_arrays(bm25_model, path: str) -> None:
+    """Convert a fitted rank_bm25 BM25Okapi model into the .npz layout read by BM25Arrays"""
+    terms = sorted(bm25_model.idf)
+    term_rows = {term: row for row, term in enumerate(terms)}
+    postings: List[List[tuple]] = [[] for _ in terms]
+    for doc_id, freqs in enumerate(bm25_model.doc_freqs):
+        for term, freq in freqs.items():
+            row = term_rows.get(term)
+            if row is not None:
+                postings[row].append((doc_id, freq))
+
+    tf_indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+    tf_indptr[1:] = np.cumsum([len(p) for p in postings])
+    tf_indices = np.fromiter((d for p in postings for d, _ in p), dtype=np.int32, count=int(tf_indptr[-1]))
+    tf_data = np.fromiter((f for p in postings for _, f in p), dtype=np.float32, count=int(tf_indptr[-1]))
+
+    # np.savez stores members uncompressed, which is what lets BM25Arrays map them in place
+    np.savez(
+        path,
+        terms=np.array(terms, dtype=str),
+        idf=np.array([bm25_model.idf[t] for t in terms], dtype=np.float32),
+        doc_len=np.asarray(bm25_model.doc_len, dtype=np.int32),
+        tf_indptr=tf_indptr,
+        tf_indices=tf_indices,
+        tf_data=tf_data,
+        avgdl=np.float64(bm25_model.avgdl),
+        k1=np.float64(bm25_model.k1),
+        b=np.float64(bm25_model.b),
+    )
+
+
+def _mmap_npz(path: str) -> Dict[str, np.ndarray]:
+    """Memory-map each stored member of an .npz archive (compressed members are read normally)"""
+    arrays = {}
+    with zipfile.ZipFile(path) as zf, open(path, 'rb') as fh:
+        for info in zf.infolist():
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                with zf.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+
+            fh.seek(info.header_offset + 26)
+            name_len, extra_len = struct.unpack('<HH', fh.read(4))
+            fh.seek(info.header_offset + _LOCAL_HEADER_SIZE + name_len + extra_len)
+            version = np.lib.format.read_magic(fh)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fh)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fh)
+
+            if not shape or 0 in shape:
+                arrays[name] = np.fromfile(fh, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+            else:
+                arrays[name] = np.memmap(
+                    path, dtype=dtype, mode='r', offset=fh.tell(), shape=shape,
+                    order='F' if fortran_order else 'C'
+                )
+    return arrays
+
+
+class BM25Arrays:
+    """BM25Okapi-compatible scorer over term-major CSR term frequencies"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.idf = arrays['idf']
+        self.doc_len = arrays['doc_len']
+        self.tf_indptr = arrays['tf_indptr']
+        self.tf_indices = arrays['tf_indices']
+        self.tf_data = arrays['tf_data']
+        self.avgdl = float(arrays['avgdl'])
+        self.k1 = float(arrays['k1'])
+        self.b = float(arrays['b'])
+        self.corpus_size = len(self.doc_len)
+        self.term_rows = {str(term): row for row, term in enumerate(arrays['terms'])}
+        # Per-document length normalisation is query independent, so compute it once
+        self._norm = (self.k1 * (1 - self.b + self.b * self.doc_len / self.avgdl)).astype(np.float32)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Arrays":
+        return cls(_mmap_npz(path))
+
+    def get_scores(self, query: List[str]) -> np.ndarray:
+        """Score every document against the query, matching rank_bm25.BM25Okapi.get_scores"""
+        scores = np.zeros(self.corpus_size)
+        for token in query:
+            row = self.term_rows.get(token)
+            if row is None:
+                continue
+            start, end = self.tf_indptr[row], self.tf_indptr[row + 1]
+            docs = self.tf_indices[start:end]
+            tf = self.tf_data[start:end]
+            scores[docs] += self.idf[row] * (tf * (self.k1 + 1) / (tf + self._norm[docs]))
+        return scores
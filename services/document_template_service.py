@@ -4,16 +4,325 @@
 Document Template Service for Light Version
 Handles Word document generation for resume exports
 """
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
 import logging
-from typing import List, Dict, Optional
-from docx import Document
-from docx.shared import Inches, Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+import multiprocessing
+import os
+import re
+import struct
+import threading
+import zipfile
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, List, Dict, Optional
+import numpy as np
 from datetime import datetime
+from xml.sax.saxutils import escape
 import io
 
+if TYPE_CHECKING:
+    from docx.document import Document
+
 logger = logging.getLogger(__name__)
 
+# python-docx is imported on first export rather than at module import, so
+# workers that never build a document don't pay for loading it.
+_docx: Optional[SimpleNamespace] = None
+
+
+def _get_docx() -> SimpleNamespace:
+    global _docx
+    if _docx is None:
+        import docx
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.opc.pkgwriter import PackageWriter
+        from docx.oxml import parse_xml
+        from docx.shared import Inches
+        _docx = SimpleNamespace(
+            Document=docx.Document,
+            Inches=Inches,
+            WD_ALIGN_PARAGRAPH=WD_ALIGN_PARAGRAPH,
+            PackageWriter=PackageWriter,
+            parse_xml=parse_xml,
+        )
+    return _docx
+
+
+_W_NSDECL = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+# Deflate level for exported .docx files. Level 1 is several times cheaper than
+# zipfile's default 6 for a few percent larger output, and downloads are
+# usually recompressed by HTTP gzip anyway. 0 writes parts uncompressed (ZIP_STORED).
+DEFAULT_COMPRESSLEVEL = 1
+
+# Exports larger than this are rendered in a worker process rather than a thread
+PROCESS_POOL_THRESHOLD = 50
+# Caps concurrent async exports so bursts don't pile up threads/processes
+_export_semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        # Spawned, not forked: uvicorn's process is multithreaded, and a forked child can inherit
+        # locks held by other threads and deadlock on them
+        _process_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+def _generate_in_worker(resumes: List[Dict], template_name: str, compresslevel: int) -> bytes:
+    return document_template_service.generate_resume_document(resumes, template_name, compresslevel)
+
+# (vertical, horizontal) page margins in inches; templates not listed keep the defaults
+_TEMPLATE_MARGINS = {
+    'professional': (0.5, 0.75),
+    'compact': (0.3, 0.5),
+}
+
+# (label, resume key, override key) rows of the professional "Personal Information" table
+_PROF_FIELDS = (
+    ("Name", "name", None),
+    ("Email", "email_id", "override_email"),
+    ("Phone", "phone_number", "override_phone"),
+    ("Location", "location", None),
+    ("Current Job Title", "current_job_title", None),
+    ("LinkedIn", "linkedin_url", None),
+    ("GitHub", "github_url", None),
+)
+
+
+# Fillers the extraction pipeline / vector payload use for missing fields
+_PLACEHOLDER_VALUES = frozenset({'Unknown', 'Not Available', 'Not Found', 'N/A'})
+
+
+def _is_present(value) -> bool:
+    """False for empty values, placeholders, and lists holding nothing but those."""
+    if not value:
+        return False
+    if isinstance(value, str):
+        return value not in _PLACEHOLDER_VALUES
+    if isinstance(value, list):
+        return any(_is_present(item) for item in value)
+    return True
+
+
+def _collect_personal_info(resume: Dict, flags: Dict, fields=_PROF_FIELDS) -> List[tuple]:
+    """Return (label, value) pairs for the fields that are visible and have real content."""
+    flags_get = flags.get
+    resume_get = resume.get
+    return [
+        (label, value)
+        for label, key, override_key in fields
+        if flags_get(f"show_{key}", True)
+        and _is_present(value := (override_key and resume_get(override_key)) or resume_get(key))
+    ]
+
+
+@lru_cache(maxsize=None)
+def _page_break_template():
+    return _get_docx().parse_xml(f'<w:p {_W_NSDECL}><w:r><w:br w:type="page"/></w:r></w:p>')
+
+
+def _append_page_break(doc: Document):
+    """Same output as doc.add_page_break(), from a prebuilt element."""
+    _append_body_elements(doc.element.body, [copy.deepcopy(_page_break_template())])
+
+
+_SEPARATOR_TEXT = "─" * 80
+
+
+@lru_cache(maxsize=None)
+def _separator_template():
+    return _get_docx().parse_xml(f'<w:p {_W_NSDECL}><w:r><w:t>{_SEPARATOR_TEXT}</w:t></w:r></w:p>')
+
+
+def _append_separator(doc: Document):
+    """Same output as doc.add_paragraph(_SEPARATOR_TEXT), from a prebuilt element."""
+    _append_body_elements(doc.element.body, [copy.deepcopy(_separator_template())])
+
+
+def _append_body_elements(body_elem, elements):
+    """Append elements to the document body, keeping the trailing <w:sectPr> last."""
+    sect_pr = body_elem.sectPr
+    if sect_pr is None:
+        body_elem.extend(elements)
+        return
+    for element in elements:
+        sect_pr.addprevious(element)
+
+
+# Per-resume sections are rendered from these fragments and parsed in one go, which
+# yields the same <w:p> markup doc.add_paragraph()/add_heading() would build.
+_PARAGRAPH_XML = '<w:p>{props}{runs}</w:p>'
+_RUN_XML = '<w:r>{props}{content}</w:r>'
+_TEXT_XML = '<w:t xml:space="preserve">{}</w:t>'
+_STYLE_XML = '<w:pStyle w:val="{}"/>'
+_CENTER_XML = '<w:jc w:val="center"/>'
+_BOLD_XML = '<w:b/>'
+_FONT_SIZE_XML = '<w:sz w:val="{}"/>'  # half-points
+_RUN_BREAKS = re.compile(r'([\t\n\r])')
+
+# List fields whose values ("Python", "AWS", ...) repeat heavily across resumes
+_DEDUP_LIST_FIELDS = ('skills', 'companies_worked_with_duration', 'projects')
+
+
+def _dedup_strings(resume: Dict, interned: Dict[str, str]) -> Dict:
+    """Point repeated list values at one shared str object for the whole export."""
+    for key in _DEDUP_LIST_FIELDS:
+        values = resume.get(key)
+        if isinstance(values, list):
+            resume[key] = [interned.setdefault(v, v) if isinstance(v, str) else v for v in values]
+    return resume
+
+
+@lru_cache(maxsize=4096)
+def _escape_text(text: str) -> str:
+    return escape(text)
+
+
+def _run_xml(text, run_props: str = '') -> str:
+    """<w:r> markup for text, mapping tabs and line breaks like Run.text does."""
+    if not text:
+        return ''
+    content = []
+    for chunk in _RUN_BREAKS.split(str(text)):
+        if chunk == '\t':
+            content.append('<w:tab/>')
+        elif chunk in ('\n', '\r'):
+            content.append('<w:br/>')
+        elif chunk:
+            content.append(_TEXT_XML.format(_escape_text(chunk)))
+    props = f'<w:rPr>{run_props}</w:rPr>' if run_props else ''
+    return _RUN_XML.format(props=props, content=''.join(content))
+
+
+def _paragraph_xml(text='', style_id: Optional[str] = None, center: bool = False,
+                   run_props: str = '') -> str:
+    props = (_STYLE_XML.format(style_id) if style_id else '') + (_CENTER_XML if center else '')
+    if props:
+        props = f'<w:pPr>{props}</w:pPr>'
+    return _PARAGRAPH_XML.format(props=props, runs=_run_xml(text, run_props))
+
+
+def _heading_xml(text: str, level: int) -> str:
+    return _paragraph_xml(text, f'Heading{level}')
+
+
+def _bullets_xml(items, style_id: str = 'ListBullet') -> List[str]:
+    return [_paragraph_xml(f"• {item}", style_id) for item in items]
+
+
+def _append_paragraphs(body_elem, paragraphs: List[str]):
+    """Parse the rendered paragraphs as a single fragment and append them to the body."""
+    if not paragraphs:
+        return
+    fragment = _get_docx().parse_xml(f'<w:body {_W_NSDECL}>{"".join(paragraphs)}</w:body>')
+    _append_body_elements(body_elem, list(fragment))
+
+
+def _format_scores(raw_scores: list, precision: int) -> List[str]:
+    """Format similarity scores as percentages in one pass; unparsable scores become "N/A"."""
+    try:
+        scores = np.asarray(raw_scores, dtype=np.float64)
+    except (TypeError, ValueError):
+        scores = np.empty(len(raw_scores), dtype=np.float64)
+        for i, raw in enumerate(raw_scores):
+            try:
+                scores[i] = float(raw)
+            except (TypeError, ValueError):
+                scores[i] = np.nan
+    formatted = np.char.mod(f'%.{precision}f%%', scores * 100).tolist()
+    for i in np.flatnonzero(np.isnan(scores)).tolist():
+        formatted[i] = "N/A"
+    return formatted
+
+
+class _DeflateCache:
+    """Bounded LRU of raw-deflated OPC part blobs keyed by content hash."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compress(self, blob: bytes, compresslevel: int) -> tuple:
+        """Return (crc32, deflated bytes) for blob, compressing only on a cache miss."""
+        key = (hashlib.blake2b(blob, digest_size=16).digest(), compresslevel)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+        entry = (zlib.crc32(blob), compressor.compress(blob) + compressor.flush())
+        with self._lock:
+            self._entries[key] = entry
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+
+class _CachingZipPkgWriter:
+    """
+    Physical package writer for python-docx's PackageWriter that emits the zip
+    container directly, reusing cached deflate output for parts whose bytes
+    have not changed (styles, theme, numbering, ... are identical across exports).
+    """
+
+    def __init__(self, stream, cache: _DeflateCache, compresslevel: int = DEFAULT_COMPRESSLEVEL):
+        self._stream = stream
+        self._cache = cache
+        self._compresslevel = compresslevel
+        self._offset = 0
+        self._central_directory = []
+        now = datetime.now()
+        self._dos_time = (now.hour << 11) | (now.minute << 5) | (now.second // 2)
+        self._dos_date = ((now.year - 1980) << 9) | (now.month << 5) | now.day
+
+    def write(self, pack_uri, blob: bytes):
+        name = pack_uri.membername.encode('utf-8')
+        if self._compresslevel == 0:
+            compress_type = zipfile.ZIP_STORED
+            crc, data = zlib.crc32(blob), blob
+        else:
+            compress_type = zipfile.ZIP_DEFLATED
+            crc, data = self._cache.get_or_compress(blob, self._compresslevel)
+        header = struct.pack(
+            zipfile.structFileHeader, zipfile.stringFileHeader,
+            20, 0, 0, compress_type, self._dos_time, self._dos_date,
+            crc, len(data), len(blob), len(name), 0,
+        )
+        self._central_directory.append(struct.pack(
+            zipfile.structCentralDir, zipfile.stringCentralDir,
+            20, 0, 20, 0, 0, compress_type, self._dos_time, self._dos_date,
+            crc, len(data), len(blob), len(name), 0, 0, 0, 0, 0, self._offset,
+        ) + name)
+        self._stream.write(header)
+        self._stream.write(name)
+        self._stream.write(data)
+        self._offset += len(header) + len(name) + len(data)
+
+    def close(self):
+        central_directory = b''.join(self._central_directory)
+        self._stream.write(central_directory)
+        self._stream.write(struct.pack(
+            zipfile.structEndArchive, zipfile.stringEndArchive,
+            0, 0, len(self._central_directory), len(self._central_directory),
+            len(central_directory), self._offset, 0,
+        ))
+
+
 class DocumentTemplateService:
     def __init__(self):
         self.templates = {
@@ -21,82 +330,116 @@ class DocumentTemplateService:
             'modern': self._create_modern_template,
             'compact': self._create_compact_template
         }
+        # Pre-built per-template documents (default template parsed, margins set),
+        # built on first use; each export deep-copies one instead of calling Document() again.
+        self._skeletons = {}
+        self._part_cache = _DeflateCache()
+
+    @staticmethod
+    def _build_skeleton(template_name: str) -> Document:
+        d = _get_docx()
+        doc = d.Document()
+        margins = _TEMPLATE_MARGINS.get(template_name)
+        if margins is not None:
+            vertical, horizontal = d.Inches(margins[0]), d.Inches(margins[1])
+            for section in doc.sections:
+                section.top_margin = vertical
+                section.bottom_margin = vertical
+                section.left_margin = horizontal
+                section.right_margin = horizontal
+        return doc
 
-    def _get_visible_value(self, key: str, resume: Dict, flags: Dict, override_key: Optional[str] = None):
-        show_flag = flags.get(f"show_{key}", True)
-        if not show_flag:
-            return None
-        if override_key and resume.get(override_key):
-            return resume[override_key]
-        return resume.get(key)
-
-    def generate_resume_document(self, resumes: List[Dict], template_name: str = 'professional') -> bytes:
+    def _new_document(self, template_name: str) -> Document:
+        skeleton = self._skeletons.get(template_name)
+        if skeleton is None:
+            skeleton = self._skeletons[template_name] = self._build_skeleton(template_name)
+        return copy.deepcopy(skeleton)
+
+    def _save_document(self, doc: Document, stream, compresslevel: int = DEFAULT_COMPRESSLEVEL):
+        """Equivalent of doc.save(stream) that skips re-deflating unchanged parts."""
+        package = doc.part.package
+        parts = package.parts
+        for part in parts:
+            part.before_marshal()
+        writer = _CachingZipPkgWriter(stream, self._part_cache, compresslevel)
+        package_writer = _get_docx().PackageWriter
+        package_writer._write_content_types_stream(writer, parts)
+        package_writer._write_pkg_rels(writer, package.rels)
+        package_writer._write_parts(writer, parts)
+        writer.close()
+
+    def generate_resume_document(self, resumes: List[Dict], template_name: str = 'professional',
+                                 compresslevel: int = DEFAULT_COMPRESSLEVEL) -> bytes:
         try:
             if template_name not in self.templates:
                 template_name = 'professional'
 
+            # The professional layout shows two decimals and "N/A" for a missing score;
+            # the others show one decimal and treat a missing score as 0.
+            if template_name == 'professional':
+                score_strs = _format_scores([r.get('similarity_score') for r in resumes], 2)
+            else:
+                score_strs = _format_scores([r.get('similarity_score', 0) for r in resumes], 1)
+            interned = {}
+            resumes = [
+                _dedup_strings({**r, '_score_str': score_str}, interned)
+                for r, score_str in zip(resumes, score_strs)
+            ]
+
             doc = self.templates[template_name](resumes)
             doc_bytes = io.BytesIO()
-            doc.save(doc_bytes)
+            self._save_document(doc, doc_bytes, compresslevel)
             doc_bytes.seek(0)
             return doc_bytes.getvalue()
         except Exception as e:
             logger.error(f"Document generation failed: {e}")
             raise Exception(f"Failed to generate document: {str(e)}")
 
+    async def generate_resume_document_async(self, resumes: List[Dict], template_name: str = 'professional',
+                                             compresslevel: int = DEFAULT_COMPRESSLEVEL) -> bytes:
+        """Non-blocking generate_resume_document for async handlers."""
+        async with _export_semaphore:
+            if len(resumes) > PROCESS_POOL_THRESHOLD:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    _get_process_pool(), _generate_in_worker, resumes, template_name, compresslevel
+                )
+            return await asyncio.to_thread(self.generate_resume_document, resumes, template_name, compresslevel)
+
     def _create_professional_template(self, resumes: List[Dict]) -> Document:
-        doc = Document()
-        for section in doc.sections:
-            section.top_margin = Inches(0.5)
-            section.bottom_margin = Inches(0.5)
-            section.left_margin = Inches(0.75)
-            section.right_margin = Inches(0.75)
+        doc = self._new_document('professional')
+        align_center = _get_docx().WD_ALIGN_PARAGRAPH.CENTER
 
         title = doc.add_heading('Selected Resume Profiles', 0)
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        title.alignment = align_center
 
         info_para = doc.add_paragraph()
         info_para.add_run(f"Generated on: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}")
         info_para.add_run(f"\nTotal Profiles: {len(resumes)}")
-        info_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        info_para.alignment = align_center
 
-        doc.add_page_break()
+        _append_page_break(doc)
 
         for idx, resume in enumerate(resumes, 1):
             self._add_professional_resume(doc, resume, idx)
             if idx < len(resumes):
-                doc.add_page_break()
+                _append_page_break(doc)
 
         return doc
 
     def _add_professional_resume(self, doc: Document, resume: Dict, index: int):
-        doc.add_heading(f"Profile #{index}", level=1)
-        doc.add_heading('Personal Information', level=2)
+        body = doc.element.body
+        _append_paragraphs(body, [
+            _heading_xml(f"Profile #{index}", 1),
+            _heading_xml('Personal Information', 2),
+        ])
         personal_table = doc.add_table(rows=0, cols=2)
         personal_table.style = 'Table Grid'
 
         flags = resume.get("visibility_flags", {})
-        personal_info = []
-
-        def add_row(label, key, override_key=None):
-            value = self._get_visible_value(key, resume, flags, override_key)
-            if value:
-                personal_info.append((label, value))
-
-        add_row("Name", "name")
-        add_row("Email", "email_id", "override_email")
-        add_row("Phone", "phone_number", "override_phone")
-        add_row("Location", "location")
-        add_row("Current Job Title", "current_job_title")
-        add_row("LinkedIn", "linkedin_url")
-        add_row("GitHub", "github_url")
-
-        score = resume.get("similarity_score")
-        try:
-            score_str = f"{float(score):.2%}" if score is not None else "N/A"
-        except:
-            score_str = "N/A"
-        personal_info.append(("Similarity Score", score_str))
+        personal_info = _collect_personal_info(resume, flags)
+
+        personal_info.append(("Similarity Score", resume['_score_str']))
 
         for label, value in personal_info:
             row = personal_table.add_row()
@@ -104,52 +447,51 @@ class DocumentTemplateService:
             row.cells[1].text = str(value)
             row.cells[0].paragraphs[0].runs[0].bold = True
 
-        if resume.get('objective'):
-            doc.add_heading('Professional Summary', level=2)
-            doc.add_paragraph(resume.get('objective', ''))
+        paragraphs = []
+        if _is_present(objective := resume.get('objective')):
+            paragraphs.append(_heading_xml('Professional Summary', 2))
+            paragraphs.append(_paragraph_xml(objective))
 
-        if resume.get('skills'):
-            doc.add_heading('Skills', level=2)
-            skills = resume.get('skills', [])
+        if _is_present(skills := resume.get('skills')):
+            paragraphs.append(_heading_xml('Skills', 2))
             skills_text = ', '.join(skills) if isinstance(skills, list) else str(skills)
-            doc.add_paragraph(skills_text)
+            paragraphs.append(_paragraph_xml(skills_text))
 
-        if resume.get('experience_summary'):
-            doc.add_heading('Experience Summary', level=2)
-            doc.add_paragraph(resume.get('experience_summary', ''))
+        if _is_present(experience := resume.get('experience_summary')):
+            paragraphs.append(_heading_xml('Experience Summary', 2))
+            paragraphs.append(_paragraph_xml(experience))
 
-        if resume.get('companies_worked_with_duration'):
-            doc.add_heading('Work History', level=2)
-            companies = resume.get('companies_worked_with_duration', [])
-            for company in companies:
-                doc.add_paragraph(f"• {company}", style='List Bullet')
+        if _is_present(companies := resume.get('companies_worked_with_duration')):
+            paragraphs.append(_heading_xml('Work History', 2))
+            paragraphs.extend(_bullets_xml(companies))
 
-        if resume.get('qualifications_summary'):
-            doc.add_heading('Qualifications', level=2)
-            doc.add_paragraph(resume.get('qualifications_summary', ''))
+        if _is_present(qualifications := resume.get('qualifications_summary')):
+            paragraphs.append(_heading_xml('Qualifications', 2))
+            paragraphs.append(_paragraph_xml(qualifications))
 
-        if resume.get('projects'):
-            doc.add_heading('Projects', level=2)
-            for project in resume.get('projects', []):
-                doc.add_paragraph(f"• {project}", style='List Bullet')
+        if _is_present(projects := resume.get('projects')):
+            paragraphs.append(_heading_xml('Projects', 2))
+            paragraphs.extend(_bullets_xml(projects))
 
         additional_info = []
-        if resume.get('availability_status'):
-            additional_info.append(f"Availability: {resume.get('availability_status')}")
-        if resume.get('work_authorization_status'):
-            additional_info.append(f"Work Authorization: {resume.get('work_authorization_status')}")
-        if resume.get('_original_filename'):
-            additional_info.append(f"Source File: {resume.get('_original_filename')}")
+        if _is_present(availability := resume.get('availability_status')):
+            additional_info.append(f"Availability: {availability}")
+        if _is_present(work_authorization := resume.get('work_authorization_status')):
+            additional_info.append(f"Work Authorization: {work_authorization}")
+        if _is_present(original_filename := resume.get('_original_filename')):
+            additional_info.append(f"Source File: {original_filename}")
 
         if additional_info:
-            doc.add_heading('Additional Information', level=2)
-            for info in additional_info:
-                doc.add_paragraph(f"• {info}", style='List Bullet')
+            paragraphs.append(_heading_xml('Additional Information', 2))
+            paragraphs.extend(_bullets_xml(additional_info))
+
+        _append_paragraphs(body, paragraphs)
 
     def _create_modern_template(self, resumes: List[Dict]) -> Document:
-        doc = Document()
+        doc = self._new_document('modern')
+        align_center = _get_docx().WD_ALIGN_PARAGRAPH.CENTER
         title = doc.add_heading('Resume Portfolio', 0)
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        title.alignment = align_center
 
         summary_table = doc.add_table(rows=1, cols=3)
         summary_table.style = 'Light Shading Accent 1'
@@ -163,55 +505,40 @@ class DocumentTemplateService:
         data_row.cells[1].text = datetime.now().strftime('%Y-%m-%d')
         data_row.cells[2].text = 'Modern'
 
-        doc.add_page_break()
+        _append_page_break(doc)
 
         for idx, resume in enumerate(resumes, 1):
             self._add_modern_resume(doc, resume, idx)
             if idx < len(resumes):
-                doc.add_page_break()
+                _append_page_break(doc)
         return doc
 
     def _add_modern_resume(self, doc: Document, resume: Dict, index: int):
-        header = doc.add_paragraph()
-        run = header.add_run(f"CANDIDATE #{index:02d}")
-        run.bold = True
-        run.font.size = Pt(16)
-        header.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        name_para = doc.add_paragraph()
-        name_run = name_para.add_run(resume.get('name', 'Name Not Available').upper())
-        name_run.bold = True
-        name_run.font.size = Pt(20)
-        name_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        contact_info = []
-        for key in ['email_id', 'phone_number', 'location']:
-            val = resume.get(key)
-            if val and val != 'Unknown':
-                contact_info.append(val)
-
-        contact_para = doc.add_paragraph(' | '.join(contact_info))
-        contact_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        try:
-            score = float(resume.get("similarity_score", 0))
-            score_text = f"{score:.1%}"
-        except:
-            score_text = "N/A"
-
-        score_para = doc.add_paragraph(f"MATCH SCORE: {score_text}")
-        score_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        name = resume.get('name', 'Name Not Available')
+        email = resume.get('email_id')
+        phone = resume.get('phone_number')
+        location = resume.get('location')
+        score_str = resume.get('_score_str', 'N/A')
+
+        contact_info = [val for val in (email, phone, location) if _is_present(val)]
+
+        paragraphs = [
+            _paragraph_xml(f"CANDIDATE #{index:02d}", center=True,
+                           run_props=_BOLD_XML + _FONT_SIZE_XML.format(32)),
+            _paragraph_xml(name.upper(), center=True,
+                           run_props=_BOLD_XML + _FONT_SIZE_XML.format(40)),
+        ]
+        if contact_info:
+            paragraphs.append(_paragraph_xml(' | '.join(contact_info), center=True))
+        paragraphs.append(_paragraph_xml(f"MATCH SCORE: {score_str}", center=True))
+        _append_paragraphs(doc.element.body, paragraphs)
 
     def _create_compact_template(self, resumes: List[Dict]) -> Document:
-        doc = Document()
-        for section in doc.sections:
-            section.top_margin = Inches(0.3)
-            section.bottom_margin = Inches(0.3)
-            section.left_margin = Inches(0.5)
-            section.right_margin = Inches(0.5)
+        doc = self._new_document('compact')
+        align_center = _get_docx().WD_ALIGN_PARAGRAPH.CENTER
 
         title = doc.add_heading('Resume Summary Report', 0)
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        title.alignment = align_center
 
         doc.add_paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')} | Total Profiles: {len(resumes)}")
         doc.add_paragraph()
@@ -219,37 +546,41 @@ class DocumentTemplateService:
         for idx, resume in enumerate(resumes, 1):
             self._add_compact_resume(doc, resume, idx)
             if idx < len(resumes):
-                doc.add_paragraph("─" * 80)
+                _append_separator(doc)
         return doc
 
     def _add_compact_resume(self, doc: Document, resume: Dict, index: int):
-        header = doc.add_paragraph()
-        try:
-            score = float(resume.get("similarity_score", 0))
-            score_text = f"{score:.1%}"
-        except:
-            score_text = "N/A"
-
-        header.add_run(f"{index}. {resume.get('name', 'N/A')} | {resume.get('current_job_title', 'N/A')} | Score: {score_text}").bold = True
-
-        contact_info = [resume.get('email_id', ''), resume.get('phone_number', ''), resume.get('location', '')]
-        filtered = [x for x in contact_info if x and x != "Unknown"]
-        doc.add_paragraph(f"Contact: {' | '.join(filtered)}")
-
-        skills = resume.get('skills', [])
-        if skills:
+        name = resume.get('name', 'N/A')
+        title = resume.get('current_job_title', 'N/A')
+        email = resume.get('email_id')
+        phone = resume.get('phone_number')
+        location = resume.get('location')
+        score_str = resume.get('_score_str', 'N/A')
+        skills = resume.get('skills') or []
+        exp = resume.get('experience_summary') or ''
+
+        paragraphs = [_paragraph_xml(
+            f"{index}. {name} | {title} | Score: {score_str}",
+            run_props=_BOLD_XML,
+        )]
+
+        filtered = [x for x in (email, phone, location) if _is_present(x)]
+        if filtered:
+            paragraphs.append(_paragraph_xml(f"Contact: {' | '.join(filtered)}"))
+
+        if _is_present(skills):
             if isinstance(skills, list):
                 skills_text = ', '.join(skills[:8])
             else:
                 skills_text = str(skills)[:100]
-            doc.add_paragraph(f"Skills: {skills_text}")
+            paragraphs.append(_paragraph_xml(f"Skills: {skills_text}"))
 
-        if resume.get('experience_summary'):
-            exp = resume['experience_summary']
+        if _is_present(exp):
             exp = exp[:150] + "..." if len(exp) > 150 else exp
-            doc.add_paragraph(f"Experience: {exp}")
+            paragraphs.append(_paragraph_xml(f"Experience: {exp}"))
 
-        doc.add_paragraph()
+        paragraphs.append(_paragraph_xml())
+        _append_paragraphs(doc.element.body, paragraphs)
 
     def get_available_templates(self) -> List[str]:
         return list(self.templates.keys())
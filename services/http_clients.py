@@ -0,0 +1,50 @@
+"""
+Shared HTTP Clients
+Long-lived httpx.AsyncClient instances reused across requests (keep-alive, HTTP/2)
+"""
+import httpx
+from typing import Optional
+
+_llm_client: Optional[httpx.AsyncClient] = None
+_qdrant_client: Optional[httpx.AsyncClient] = None
+
+
+def get_llm_client() -> httpx.AsyncClient:
+    """Get (or lazily create) the pooled client used for outbound LLM calls"""
+    global _llm_client
+    if _llm_client is None or _llm_client.is_closed:
+        _llm_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            http2=True,
+            timeout=10.0
+        )
+    return _llm_client
+
+
+async def close_llm_client():
+    """Close the shared LLM client; call on application shutdown"""
+    global _llm_client
+    if _llm_client is not None:
+        await _llm_client.aclose()
+        _llm_client = None
+
+
+def get_qdrant_client() -> httpx.AsyncClient:
+    """Get (or lazily create) the pooled client used for Qdrant requests"""
+    global _qdrant_client
+    if _qdrant_client is None or _qdrant_client.is_closed:
+        # Keep every pooled connection alive so bursts of searches don't reconnect afterwards
+        _qdrant_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=100),
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0)
+        )
+    return _qdrant_client
+
+
+async def close_qdrant_client():
+    """Close the shared Qdrant client; call on application shutdown"""
+    global _qdrant_client
+    if _qdrant_client is not None:
+        await _qdrant_client.aclose()
+        _qdrant_client = None
@@ -2,17 +2,58 @@
 Modular Query Enhancement Service
 Supports multiple enhancement strategies with easy switching
 """
+import asyncio
+import hashlib
 import httpx
 import json
+import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List
 from enum import Enum
+from functools import partial
 import os
+import random
+import uuid
+
+import numpy as np
+
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    json_loads = json.loads
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+from .http_clients import get_llm_client
+from .batching import drain_batch
+
+logger = logging.getLogger(__name__)
+
+
+# Stripped from token edges when normalizing; '+', '#' and inner '.' stay (C++, C#, Node.js)
+_EDGE_PUNCTUATION = "\"'`,;:!?()[]{}<>"
+
+
+def _normalize(query: str) -> str:
+    """Cache/dedup form of a query: lowercased, single-spaced, wrapping punctuation dropped"""
+    tokens = (token.strip(_EDGE_PUNCTUATION).rstrip(".") for token in query.lower().split())
+    return " ".join(token for token in tokens if token)
+
+
+def _context_key(context: Optional[Dict[str, Any]]) -> str:
+    """Stable string form of an enhancement context, for cache/dedup keys"""
+    return json.dumps(context or {}, sort_keys=True, default=str)
 
 
 class EnhancementStrategy(Enum):
     NONE = "none"
     OPENAI = "openai"
+    OPENAI_BATCHED = "openai_batched"
     ANTHROPIC = "anthropic"
     LOCAL_LLM = "local_llm"
     CUSTOM_API = "custom_api"
@@ -34,64 +75,309 @@ class NoEnhancement(QueryEnhancer):
         return original_query
 
 
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+_ENHANCEMENT_GUIDELINES = """Guidelines:
+1. Expand abbreviations and acronyms
+2. Add relevant synonyms and related terms
+3. Include both technical and soft skills variations
+4. Keep it concise but comprehensive
+5. Focus on searchable keywords"""
+
+
 class OpenAIEnhancer(QueryEnhancer):
     """OpenAI-based query enhancement"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Identical on every request, so it forms a cacheable prompt prefix; the query is the user message
+    _SYSTEM_PROMPT = f"""You are a resume search expert. Enhance the user's search query to improve vector search results for finding relevant resumes.
+
+{_ENHANCEMENT_GUIDELINES}
+
+Return only the enhanced query, no explanations."""
+    
+    max_attempts = 3
+    max_backoff = 8.0  # seconds
+    failure_threshold = 5
+    cooldown = 30.0  # seconds
+    
+    def __init__(self, api_key: Optional[str] = None, client: Optional[httpx.AsyncClient] = None):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.base_url = "https://api.openai.com/v1/chat/completions"
+        self._client = client
+        # Built once; the shared client also serves other endpoints, so these stay per-enhancer
+        self._auth_headers = {"Authorization": f"Bearer {self.api_key}"}
+        self._headers = {**self._auth_headers, "Content-Type": "application/json"}
+        # Circuit breaker: after failure_threshold failed calls in a row, skip the API for cooldown seconds
+        self._consecutive_failures = 0
+        self._circuit_open_until = 0.0
+        # Caps in-flight API calls so traffic spikes queue here instead of tripping rate limits
+        self._semaphore = asyncio.Semaphore(int(os.getenv("OPENAI_MAX_CONCURRENCY", "32")))
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_llm_client()
     
     async def enhance_query(self, original_query: str, context: Optional[Dict[str, Any]] = None) -> str:
         if not self.api_key:
             return original_query
         
-        prompt = self._build_enhancement_prompt(original_query, context)
+        enhanced_query = await self._chat(
+            [
+                {"role": "system", "content": self._SYSTEM_PROMPT},
+                {"role": "user", "content": original_query}
+            ],
+            max_tokens=150
+        )
+        return enhanced_query.strip() if enhanced_query else original_query
+    
+    async def _chat(self, messages: List[Dict[str, str]], max_tokens: int) -> Optional[str]:
+        """
+        POST a chat completion, retrying 429/5xx and transport errors with exponential
+        backoff. Returns the reply text, or None on failure or while the circuit is open.
+        """
+        if time.monotonic() < self._circuit_open_until:
+            return None
         
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.base_url,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "gpt-3.5-turbo",
-                        "messages": [{"role": "user", "content": prompt}],
-                        "max_tokens": 150,
-                        "temperature": 0.3
-                    },
-                    timeout=10.0
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    enhanced_query = result["choices"][0]["message"]["content"].strip()
-                    return enhanced_query
-                else:
-                    print(f"OpenAI API error: {response.status_code}")
-                    return original_query
-                    
-        except Exception as e:
-            print(f"Query enhancement failed: {e}")
-            return original_query
+        for attempt in range(self.max_attempts):
+            if attempt:
+                await asyncio.sleep(min(self.max_backoff, 2 ** (attempt - 1)) + random.uniform(0, 1))
+            try:
+                async with self._semaphore:
+                    response = await self.client.post(
+                        self.base_url,
+                        headers=self._headers,
+                        content=json_dumps({
+                            "model": "gpt-3.5-turbo",
+                            "messages": messages,
+                            "max_tokens": max_tokens,
+                            "temperature": 0.3
+                        }),
+                        timeout=10.0
+                    )
+            except httpx.TransportError as e:
+                logger.warning("Query enhancement failed: %s", e)
+                continue
+            except Exception as e:
+                logger.exception("Query enhancement failed: %s", e)
+                break
+            
+            if response.status_code == 200:
+                try:
+                    content = json_loads(response.content)["choices"][0]["message"]["content"]
+                except Exception as e:
+                    logger.warning("Query enhancement returned an unreadable response: %s", e)
+                    break
+                self._consecutive_failures = 0
+                return content
+            logger.warning("OpenAI API error: %s", response.status_code)
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                break
+        
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= self.failure_threshold:
+            self._circuit_open_until = time.monotonic() + self.cooldown
+        return None
+
+
+class BatchingOpenAIEnhancer(OpenAIEnhancer):
+    """
+    OpenAI enhancement that coalesces queries arriving within a short window
+    into a single chat call returning a JSON array (shared prompt, fewer requests).
+    Falls back to one call per query if the batched response can't be parsed.
+    """
+    
+    max_batch_size = 16
+    flush_interval = 0.025  # seconds
     
-    def _build_enhancement_prompt(self, query: str, context: Optional[Dict[str, Any]]) -> str:
-        return f"""
-You are a resume search expert. Enhance the following search query to improve vector search results for finding relevant resumes.
+    _BATCH_SYSTEM_PROMPT = f"""You are a resume search expert. The user sends a JSON array of search queries. Enhance each one to improve vector search results for finding relevant resumes.
 
-Original query: "{query}"
+{_ENHANCEMENT_GUIDELINES}
 
-Guidelines:
-1. Expand abbreviations and acronyms
-2. Add relevant synonyms and related terms
-3. Include both technical and soft skills variations
-4. Keep it concise but comprehensive
-5. Focus on searchable keywords
+Return only a JSON array with one enhanced query string per input query, in the same order, no explanations."""
+    
+    def __init__(self, api_key: Optional[str] = None, client: Optional[httpx.AsyncClient] = None):
+        super().__init__(api_key, client)
+        self._queue: Optional[asyncio.Queue] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._batch_tasks: set = set()
+    
+    async def enhance_query(self, original_query: str, context: Optional[Dict[str, Any]] = None) -> str:
+        if not self.api_key:
+            return original_query
+        
+        loop = asyncio.get_running_loop()
+        if self._flush_task is None or self._flush_task.done() or self._flush_task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._flush_task = loop.create_task(self._flush_loop())
+        
+        future = loop.create_future()
+        await self._queue.put((original_query, context, future))
+        return await future
+    
+    async def _flush_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await drain_batch(self._queue, self.max_batch_size, self.flush_interval)
+            task = loop.create_task(self._process_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _process_batch(self, batch: List[tuple]):
+        try:
+            results = None
+            if len(batch) > 1:
+                results = await self._enhance_many([query for query, _, _ in batch])
+            if results is None:
+                results = await asyncio.gather(*(
+                    OpenAIEnhancer.enhance_query(self, query, context) for query, context, _ in batch
+                ))
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            logger.warning("Batched query enhancement failed: %s", e)
+        finally:
+            # Nobody is left waiting forever: unresolved callers get their original query back
+            for query, _, future in batch:
+                if not future.done():
+                    future.set_result(query)
+    
+    async def _enhance_many(self, queries: List[str]) -> Optional[List[str]]:
+        content = await self._chat(
+            [
+                {"role": "system", "content": self._BATCH_SYSTEM_PROMPT},
+                {"role": "user", "content": json_dumps(queries).decode()}
+            ],
+            max_tokens=150 * len(queries)
+        )
+        if content is None:
+            # The API itself failed (already retried); per-query calls would fail the same way
+            return list(queries)
+        try:
+            enhanced = json_loads(content)
+        except Exception as e:
+            logger.warning("Batched query enhancement failed, retrying per query: %s", e)
+            return None
+        
+        if (not isinstance(enhanced, list) or len(enhanced) != len(queries)
+                or not all(isinstance(item, str) for item in enhanced)):
+            logger.warning("Batched enhancement returned an unexpected shape, retrying per query")
+            return None
+        return [item.strip() or query for item, query in zip(enhanced, queries)]
 
-Return only the enhanced query, no explanations.
 
-Enhanced query:"""
+class BatchAPIOpenAIEnhancer(OpenAIEnhancer):
+    """
+    OpenAI enhancement through the Batch API: half the per-token cost and a separate
+    rate-limit pool, but results arrive within the 24h completion window.
+    Not a search strategy: only the offline pre-enhancement job
+    (QueryEnhancementService.pre_enhance) uses it, to fill the interactive caches.
+    Queries are submitted as batch jobs of at most max_batch_bytes of JSONL each.
+    """
+    
+    files_url = "https://api.openai.com/v1/files"
+    batches_url = "https://api.openai.com/v1/batches"
+    poll_interval = 20.0  # seconds
+    max_batch_bytes = 10 * 1024 * 1024
+    
+    def __init__(self, api_key: Optional[str] = None, client: Optional[httpx.AsyncClient] = None):
+        super().__init__(api_key, client)
+        self._pending: List[tuple] = []  # (custom_id, query, encoded JSONL line, future)
+        self._pending_bytes = 0
+        self._batch_tasks: set = set()
+    
+    async def enhance_query(self, original_query: str, context: Optional[Dict[str, Any]] = None) -> str:
+        return (await self.enhance_many([original_query], context))[0]
+    
+    async def enhance_many(self, queries: List[str], context: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Enhance queries in as few batch jobs as fit max_batch_bytes; failed ones come back unchanged"""
+        if not self.api_key:
+            return list(queries)
+        
+        futures = [self._enqueue(query) for query in queries]
+        if self._pending:
+            self._submit_pending()
+        return list(await asyncio.gather(*futures))
+    
+    def _enqueue(self, original_query: str) -> asyncio.Future:
+        custom_id = uuid.uuid4().hex
+        line = json_dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": "gpt-3.5-turbo",
+                "messages": [
+                    {"role": "system", "content": self._SYSTEM_PROMPT},
+                    {"role": "user", "content": original_query}
+                ],
+                "max_tokens": 150,
+                "temperature": 0.3
+            }
+        })
+        if self._pending and self._pending_bytes + len(line) + 1 > self.max_batch_bytes:
+            self._submit_pending()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((custom_id, original_query, line, future))
+        self._pending_bytes += len(line) + 1
+        return future
+    
+    def _submit_pending(self):
+        batch, self._pending, self._pending_bytes = self._pending, [], 0
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _run_batch(self, batch: List[tuple]):
+        """Upload the JSONL, create the batch job, poll it, and resolve futures from its output"""
+        waiting = {custom_id: (query, future) for custom_id, query, _, future in batch}
+        jsonl = b"\n".join(line for _, _, line, _ in batch)
+        try:
+            upload = await self.client.post(
+                self.files_url,
+                headers=self._auth_headers,
+                data={"purpose": "batch"},
+                files={"file": ("query_enhancement.jsonl", jsonl, "application/jsonl")},
+                timeout=60.0
+            )
+            upload.raise_for_status()
+            created = await self.client.post(
+                self.batches_url,
+                headers=self._headers,
+                content=json_dumps({
+                    "input_file_id": json_loads(upload.content)["id"],
+                    "endpoint": "/v1/chat/completions",
+                    "completion_window": "24h"
+                })
+            )
+            created.raise_for_status()
+            job = json_loads(created.content)
+            
+            while job["status"] not in ("completed", "failed", "expired", "cancelled"):
+                await asyncio.sleep(self.poll_interval)
+                polled = await self.client.get(f"{self.batches_url}/{job['id']}", headers=self._auth_headers)
+                polled.raise_for_status()
+                job = json_loads(polled.content)
+            
+            # Expired/cancelled jobs still publish whatever requests did complete
+            if job.get("output_file_id"):
+                output = await self.client.get(f"{self.files_url}/{job['output_file_id']}/content", headers=self._auth_headers, timeout=60.0)
+                output.raise_for_status()
+                for line in output.content.splitlines():
+                    record = json_loads(line)
+                    query, future = waiting.get(record.get("custom_id"), (None, None))
+                    response = record.get("response") or {}
+                    if future is not None and not future.done() and response.get("status_code") == 200:
+                        enhanced_query = response["body"]["choices"][0]["message"]["content"].strip()
+                        future.set_result(enhanced_query or query)
+            if job["status"] != "completed":
+                logger.warning("OpenAI batch %s ended with status %s", job["id"], job["status"])
+        except Exception as e:
+            logger.warning("OpenAI batch enhancement failed: %s", e)
+        finally:
+            for query, future in waiting.values():
+                if not future.done():
+                    future.set_result(query)
 
 
 class AnthropicEnhancer(QueryEnhancer):
@@ -113,32 +399,37 @@ class AnthropicEnhancer(QueryEnhancer):
 class CustomAPIEnhancer(QueryEnhancer):
     """Custom API endpoint for query enhancement"""
     
-    def __init__(self, api_url: Optional[str] = None):
+    def __init__(self, api_url: Optional[str] = None, client: Optional[httpx.AsyncClient] = None):
         self.api_url = api_url or os.getenv("CUSTOM_ENHANCER_URL")
+        self._client = client
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_llm_client()
     
     async def enhance_query(self, original_query: str, context: Optional[Dict[str, Any]] = None) -> str:
         if not self.api_url:
             return original_query
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.api_url,
-                    json={
-                        "query": original_query,
-                        "context": context or {}
-                    },
-                    timeout=10.0
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    return result.get("enhanced_query", original_query)
-                else:
-                    return original_query
+            response = await self.client.post(
+                self.api_url,
+                content=json_dumps({
+                    "query": original_query,
+                    "context": context or {}
+                }),
+                headers=JSON_HEADERS,
+                timeout=10.0
+            )
+            
+            if response.status_code == 200:
+                result = json_loads(response.content)
+                return result.get("enhanced_query", original_query)
+            else:
+                return original_query
                     
         except Exception as e:
-            print(f"Custom API enhancement failed: {e}")
+            logger.warning("Custom API enhancement failed: %s", e)
             return original_query
 
 
@@ -147,7 +438,7 @@ class LocalLLMEnhancer(QueryEnhancer):
     
     def __init__(self):
         self.model = None
-        self._load_model()
+        self._model_loaded = False  # the model is loaded on first use, not at construction
     
     def _load_model(self):
         """Load local model only if dependencies are available"""
@@ -156,10 +447,13 @@ class LocalLLMEnhancer(QueryEnhancer):
             from sentence_transformers import SentenceTransformer
             self.model = SentenceTransformer('all-MiniLM-L6-v2')
         except ImportError:
-            print("Local LLM dependencies not available. Install sentence-transformers for local enhancement.")
+            logger.warning("Local LLM dependencies not available. Install sentence-transformers for local enhancement.")
             self.model = None
     
     async def enhance_query(self, original_query: str, context: Optional[Dict[str, Any]] = None) -> str:
+        if not self._model_loaded:
+            self._model_loaded = True
+            await asyncio.to_thread(self._load_model)
         if not self.model:
             return original_query
         
@@ -168,34 +462,234 @@ class LocalLLMEnhancer(QueryEnhancer):
         return original_query
 
 
+class CachedQueryEnhancer(QueryEnhancer):
+    """
+    Caching decorator around any enhancer.
+    Exact tier: SHA256(strategy|context|normalized query) -> enhanced query, in Redis when REDIS_URL
+    is set (and redis is installed), otherwise in an in-process LRU.
+    Semantic tier (optional): cosine match of the query embedding against earlier
+    queries, enabled by QUERY_CACHE_SEMANTIC_THRESHOLD (e.g. 0.92).
+    """
+    
+    def __init__(self, enhancer: QueryEnhancer, namespace: str,
+                 ttl: Optional[int] = None,
+                 semantic_threshold: Optional[float] = None,
+                 redis_url: Optional[str] = None,
+                 max_entries: int = 1024):
+        self.enhancer = enhancer
+        self.namespace = namespace
+        self.ttl = ttl if ttl is not None else int(os.getenv("QUERY_CACHE_TTL", "86400"))
+        if semantic_threshold is None and os.getenv("QUERY_CACHE_SEMANTIC_THRESHOLD"):
+            semantic_threshold = float(os.getenv("QUERY_CACHE_SEMANTIC_THRESHOLD"))
+        self.semantic_threshold = semantic_threshold
+        self.max_entries = max_entries
+        
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._redis = None
+        redis_url = redis_url or os.getenv("REDIS_URL")
+        if redis_url:
+            try:
+                import redis.asyncio as aioredis
+                self._redis = aioredis.from_url(redis_url)
+            except ImportError:
+                logger.warning("redis not installed; query cache falls back to in-process memory")
+        
+        # Flat inner-product index over normalized query embeddings (IndexFlatIP equivalent)
+        self._embedding_model = None
+        self._semantic_vectors: Optional[np.ndarray] = None
+        self._semantic_entries: List[tuple] = []  # (context key, enhanced query)
+    
+    def _cache_key(self, query: str, context_key: str) -> str:
+        raw = f"{self.namespace}|{context_key}|{query}"
+        return "query_enhancement:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    async def _get(self, key: str) -> Optional[str]:
+        if self._redis is not None:
+            try:
+                value = await self._redis.get(key)
+                return value.decode("utf-8") if value is not None else None
+            except Exception as e:
+                logger.warning("Query cache read failed: %s", e)
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return value
+    
+    async def _set(self, key: str, value: str):
+        if self._redis is not None:
+            try:
+                await self._redis.setex(key, self.ttl, value)
+                return
+            except Exception as e:
+                logger.warning("Query cache write failed: %s", e)
+        self._local[key] = (time.monotonic() + self.ttl, value)
+        self._local.move_to_end(key)
+        if len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+    
+    def _embed(self, query: str) -> Optional[np.ndarray]:
+        if self._embedding_model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+                self._embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+            except ImportError:
+                logger.warning("sentence-transformers not available; semantic query cache disabled")
+                self.semantic_threshold = None
+                return None
+        return self._embedding_model.encode(query, normalize_embeddings=True).astype(np.float32)
+    
+    def _semantic_lookup(self, embedding: np.ndarray, context_key: str) -> Optional[str]:
+        if self._semantic_vectors is None:
+            return None
+        similarities = self._semantic_vectors @ embedding
+        for idx in np.argsort(similarities)[::-1]:
+            if similarities[idx] < self.semantic_threshold:
+                break
+            entry_context, value = self._semantic_entries[idx]
+            if entry_context == context_key:
+                return value
+        return None
+    
+    def _semantic_add(self, embedding: np.ndarray, context_key: str, value: str):
+        if self._semantic_vectors is None:
+            self._semantic_vectors = embedding[np.newaxis, :]
+        else:
+            self._semantic_vectors = np.vstack([self._semantic_vectors, embedding])[-self.max_entries:]
+        self._semantic_entries.append((context_key, value))
+        self._semantic_entries = self._semantic_entries[-self.max_entries:]
+    
+    async def enhance_query(self, original_query: str, context: Optional[Dict[str, Any]] = None) -> str:
+        context_key = _context_key(context)
+        # Keyed (and embedded) by the normalized form; the enhancer still gets the original query
+        normalized = _normalize(original_query)
+        key = self._cache_key(normalized, context_key)
+        cached = await self._get(key)
+        if cached is not None:
+            return cached
+        
+        embedding = None
+        if self.semantic_threshold is not None:
+            embedding = await asyncio.to_thread(self._embed, normalized)
+            if embedding is not None:
+                cached = self._semantic_lookup(embedding, context_key)
+                if cached is not None:
+                    return cached
+        
+        enhanced = await self.enhancer.enhance_query(original_query, context)
+        # Enhancers fall back to the original query on errors; don't pin that result
+        if enhanced != original_query:
+            await self._set(key, enhanced)
+            if embedding is not None:
+                self._semantic_add(embedding, context_key, enhanced)
+        return enhanced
+    
+    async def store(self, original_query: str, enhanced: str, context: Optional[Dict[str, Any]] = None):
+        """Cache an enhancement produced elsewhere (the offline pre-enhancement job)"""
+        if enhanced == original_query:
+            return
+        context_key = _context_key(context)
+        normalized = _normalize(original_query)
+        await self._set(self._cache_key(normalized, context_key), enhanced)
+        if self.semantic_threshold is not None:
+            embedding = await asyncio.to_thread(self._embed, normalized)
+            if embedding is not None:
+                self._semantic_add(embedding, context_key, enhanced)
+
+
 class QueryEnhancementService:
     """Main service that manages different enhancement strategies"""
     
-    def __init__(self, strategy: EnhancementStrategy = EnhancementStrategy.NONE):
+    def __init__(self, strategy: EnhancementStrategy = EnhancementStrategy.NONE,
+                 client: Optional[httpx.AsyncClient] = None):
         self.strategy = strategy
-        self.enhancer = self._create_enhancer(strategy)
+        self.client = client  # None -> the shared client from http_clients
+        self._enhancers: Dict[EnhancementStrategy, QueryEnhancer] = {}
+        # In-flight enhancements by key, so concurrent identical requests share one LLM call
+        self._inflight: Dict[str, asyncio.Task] = {}
+    
+    @property
+    def enhancer(self) -> QueryEnhancer:
+        return self._get_enhancer(self.strategy)
+    
+    def _get_enhancer(self, strategy: EnhancementStrategy) -> QueryEnhancer:
+        """Build the enhancer for a strategy on first use and keep it (and its cache) for reuse"""
+        enhancer = self._enhancers.get(strategy)
+        if enhancer is None:
+            enhancer = self._enhancers[strategy] = self._create_enhancer(strategy)
+        return enhancer
     
     def _create_enhancer(self, strategy: EnhancementStrategy) -> QueryEnhancer:
         """Factory method to create appropriate enhancer"""
         enhancer_map = {
             EnhancementStrategy.NONE: NoEnhancement,
             EnhancementStrategy.OPENAI: OpenAIEnhancer,
+            EnhancementStrategy.OPENAI_BATCHED: BatchingOpenAIEnhancer,
             EnhancementStrategy.ANTHROPIC: AnthropicEnhancer,
             EnhancementStrategy.LOCAL_LLM: LocalLLMEnhancer,
             EnhancementStrategy.CUSTOM_API: CustomAPIEnhancer,
         }
         
         enhancer_class = enhancer_map.get(strategy, NoEnhancement)
-        return enhancer_class()
+        if enhancer_class is NoEnhancement:
+            return enhancer_class()
+        if issubclass(enhancer_class, (OpenAIEnhancer, CustomAPIEnhancer)):
+            enhancer = enhancer_class(client=self.client)
+        else:
+            enhancer = enhancer_class()
+        return CachedQueryEnhancer(enhancer, namespace=strategy.value)
     
     async def enhance_query(self, query: str, context: Optional[Dict[str, Any]] = None) -> str:
         """Enhance query using the configured strategy"""
-        return await self.enhancer.enhance_query(query, context)
+        key = f"{self.strategy.value}|{_context_key(context)}|{_normalize(query)}"
+        enhancement = self._inflight.get(key)
+        if enhancement is None:
+            enhancement = asyncio.ensure_future(self._get_enhancer(self.strategy).enhance_query(query, context))
+            self._inflight[key] = enhancement
+            enhancement.add_done_callback(partial(self._enhancement_finished, key))
+        # Shielded, so a caller that goes away doesn't cancel the call the others are waiting on
+        return await asyncio.shield(enhancement)
+    
+    def _enhancement_finished(self, key: str, enhancement: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not enhancement.cancelled():
+            enhancement.exception()  # mark retrieved when every caller had gone
+    
+    async def pre_enhance(self, queries: List[str],
+                          strategy: EnhancementStrategy = EnhancementStrategy.OPENAI,
+                          context: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Offline bulk job: enhance queries through the OpenAI Batch API and store the results
+        in the cache of an OpenAI search strategy, so later searches hit the cache.
+        Takes minutes to hours; never call it on a request path.
+        Returns the number of enhancements cached.
+        """
+        if strategy not in (EnhancementStrategy.OPENAI, EnhancementStrategy.OPENAI_BATCHED):
+            raise ValueError(f"Batch API pre-enhancement fills OpenAI strategy caches only, not {strategy.value}")
+        
+        # One request per normalized query; the cache is keyed by the normalized form anyway
+        by_key: Dict[str, str] = {}
+        for query in queries:
+            by_key.setdefault(_normalize(query), query)
+        unique = list(by_key.values())
+        enhanced_queries = await BatchAPIOpenAIEnhancer(client=self.client).enhance_many(unique, context)
+        
+        cache = self._get_enhancer(strategy)
+        cached = 0
+        for query, enhanced in zip(unique, enhanced_queries):
+            if enhanced != query:
+                await cache.store(query, enhanced, context)
+                cached += 1
+        logger.info("Pre-enhanced %d of %d queries into the %s cache", cached, len(unique), strategy.value)
+        return cached
     
     def switch_strategy(self, new_strategy: EnhancementStrategy):
         """Switch to a different enhancement strategy at runtime"""
         self.strategy = new_strategy
-        self.enhancer = self._create_enhancer(new_strategy)
     
     def get_current_strategy(self) -> EnhancementStrategy:
         """Get the currently active strategy"""
@@ -212,6 +706,13 @@ async def enhance_search_query(query: str, context: Optional[Dict[str, Any]] = N
     return await query_enhancement_service.enhance_query(query, context)
 
 
+async def pre_enhance_queries(queries: List[str],
+                              strategy: EnhancementStrategy = EnhancementStrategy.OPENAI,
+                              context: Optional[Dict[str, Any]] = None) -> int:
+    """Fill the enhancement cache for a batch of queries through the OpenAI Batch API (offline)"""
+    return await query_enhancement_service.pre_enhance(queries, strategy, context)
+
+
 def configure_enhancement(strategy: EnhancementStrategy):
     """Configure the global enhancement strategy"""
     query_enhancement_service.switch_strategy(strategy)
@@ -3,17 +3,72 @@ MinIO Storage Service for MVP
 Handles file uploads, bucket management, and model loading/saving.
 """
 import asyncio
+import functools
+import itertools
 import logging
+import certifi
+import urllib3
 from minio import Minio
 from minio.error import S3Error
 import io
 import os
 import pickle
 import json
-from typing import Optional, Tuple, Any, Dict
+import tempfile
+import time
+from typing import Optional, Tuple, Any, Dict, Callable, Union, IO, AsyncIterator
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+from .bm25_arrays import BM25Arrays, save_bm25_arrays
 
 logger = logging.getLogger(__name__)
 
+# Size of the loop's default executor; every MinIO SDK call runs there via asyncio.to_thread
+STORAGE_IO_WORKERS = int(os.getenv("STORAGE_IO_WORKERS", "32"))
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+UPLOAD_PART_SIZE = 10 * 1024 * 1024
+LIST_PAGE_SIZE = 1000
+LIST_FILES_WARN_THRESHOLD = 10000
+
+# Loaded sparse models are reused for this long before being fetched again, to pick up retrained ones
+SPARSE_MODEL_TTL = float(os.getenv("SPARSE_MODEL_TTL", "3600"))  # seconds
+
+# Keep mapped model files in RAM-backed tmpfs when available
+_MODEL_TMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def _unpickle_file(path: str) -> Any:
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def _read_object(client: Minio, bucket_name: str, object_name: str,
+                 dest_path: Optional[str] = None) -> Union[bytes, str]:
+    """
+    Stream an object's body in chunks, into dest_path if given, else into memory,
+    and release the pooled connection (runs in a worker thread)
+    """
+    response = client.get_object(bucket_name, object_name)
+    try:
+        if dest_path is None:
+            buffer = io.BytesIO()
+            for chunk in response.stream(DOWNLOAD_CHUNK_SIZE):
+                buffer.write(chunk)
+            return buffer.getvalue()
+        with open(dest_path, "wb") as f:
+            for chunk in response.stream(DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+        return dest_path
+    finally:
+        response.close()
+        response.release_conn()
+
+
 class StorageService:
     def __init__(self):
         # Corrected MINIO_ENDPOINT IP address
@@ -23,18 +78,39 @@ class StorageService:
         # Ensure this line is present and correctly sets the 'secure' attribute
         self.secure = os.getenv("MINIO_SECURE", "False").lower() == "true" # Convert string to boolean
 
+        # Same settings as minio's default pool, sized to the worker threads that share it
+        timeout = 300
+        http_client = urllib3.PoolManager(
+            timeout=urllib3.Timeout(connect=timeout, read=timeout),
+            maxsize=STORAGE_IO_WORKERS,
+            block=False,
+            cert_reqs="CERT_REQUIRED",
+            ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+            retries=urllib3.Retry(total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504])
+        )
+
         self.client = Minio(
             self.endpoint,
             access_key=self.access_key,
             secret_key=self.secret_key,
-            secure=self.secure # This uses the 'secure' attribute defined above
+            secure=self.secure, # This uses the 'secure' attribute defined above
+            http_client=http_client
         )
         logger.info(f"MinIO client initialized for endpoint: {self.endpoint}")
+        self._known_buckets: set = set()
+        # (bucket, bm25 object, vocab object) -> (loaded at, (bm25_model, token_to_index))
+        self._sparse_models: Dict[tuple, Tuple[float, Tuple[Any, Dict]]] = {}
+        self._sparse_model_loads: Dict[tuple, asyncio.Task] = {}
 
     async def bucket_exists(self, bucket_name: str) -> bool:
-        """Check if bucket exists"""
+        """Check if bucket exists (positive answers are remembered; buckets aren't deleted at runtime)"""
+        if bucket_name in self._known_buckets:
+            return True
         try:
-            return self.client.bucket_exists(bucket_name)
+            exists = await asyncio.to_thread(self.client.bucket_exists, bucket_name)
+            if exists:
+                self._known_buckets.add(bucket_name)
+            return exists
         except S3Error as e:
             logger.error(f"Error checking bucket {bucket_name}: {e}")
             return False
@@ -43,25 +119,34 @@ class StorageService:
         """Create bucket if it doesn't exist"""
         try:
             if not await self.bucket_exists(bucket_name):
-                self.client.make_bucket(bucket_name)
+                await asyncio.to_thread(self.client.make_bucket, bucket_name)
+                self._known_buckets.add(bucket_name)
                 logger.info(f"Created bucket: {bucket_name}")
             return True
         except S3Error as e:
             logger.error(f"Error creating bucket {bucket_name}: {e}")
             return False
     
-    async def upload_file(self, bucket_name: str, object_name: str, file_content: bytes) -> str:
-        """Upload file to MinIO"""
+    async def upload_file(self, bucket_name: str, object_name: str, data: Union[IO[bytes], bytes],
+                          length: int = -1, part_size: int = UPLOAD_PART_SIZE) -> str:
+        """
+        Upload file to MinIO, streaming from a file-like object.
+        Pass length=-1 for streams of unknown size (uploaded as multipart in part_size chunks).
+        """
+        if isinstance(data, (bytes, bytearray)):
+            data, length = io.BytesIO(data), len(data)
         try:
             # Ensure bucket exists
             await self.create_bucket_if_not_exists(bucket_name)
             
             # Upload file
-            self.client.put_object(
+            await asyncio.to_thread(
+                self.client.put_object,
                 bucket_name=bucket_name,
                 object_name=object_name,
-                data=io.BytesIO(file_content),
-                length=len(file_content)
+                data=data,
+                length=length,
+                part_size=part_size
             )
             
             minio_path = f"{bucket_name}/{object_name}"
@@ -72,20 +157,33 @@ class StorageService:
             logger.error(f"Error uploading file to MinIO: {e}", exc_info=True)
             raise Exception(f"MinIO upload failed: {str(e)}")
     
-    async def download_file(self, bucket_name: str, object_name: str) -> bytes:
-        """Download file from MinIO"""
+    async def download_file(self, bucket_name: str, object_name: str,
+                            dest_path: Optional[str] = None) -> Union[bytes, str]:
+        """Download file from MinIO; streams to dest_path (and returns it) when given"""
         try:
-            response = self.client.get_object(bucket_name, object_name)
-            return response.read()
+            return await asyncio.to_thread(_read_object, self.client, bucket_name, object_name, dest_path)
         except S3Error as e:
             logger.error(f"Error downloading file from MinIO: {e}", exc_info=True)
             raise Exception(f"MinIO download failed: {str(e)}")
     
+    async def iter_files(self, bucket_name: str, prefix: Optional[str] = None,
+                         page_size: int = LIST_PAGE_SIZE) -> AsyncIterator[str]:
+        """Yield object names in bucket, fetching page_size at a time in a worker thread"""
+        objects = self.client.list_objects(bucket_name, prefix=prefix)
+        while True:
+            page = await asyncio.to_thread(lambda: list(itertools.islice(objects, page_size)))
+            if not page:
+                return
+            for obj in page:
+                yield obj.object_name
+
     async def list_files(self, bucket_name: str, prefix: Optional[str] = None) -> list:
-        """List files in bucket"""
+        """List files in bucket (prefer iter_files for large buckets)"""
         try:
-            objects = self.client.list_objects(bucket_name, prefix=prefix)
-            return [obj.object_name for obj in objects]
+            files = [name async for name in self.iter_files(bucket_name, prefix)]
+            if len(files) > LIST_FILES_WARN_THRESHOLD:
+                logger.warning(f"list_files materialized {len(files)} objects from '{bucket_name}'; use iter_files instead")
+            return files
         except S3Error as e:
             logger.error(f"Error listing files in MinIO: {e}", exc_info=True)
             return []
@@ -93,7 +191,7 @@ class StorageService:
     async def list_all_buckets(self) -> list:
         """List all buckets"""
         try:
-            buckets = self.client.list_buckets()
+            buckets = await asyncio.to_thread(self.client.list_buckets)
             return [bucket.name for bucket in buckets]
         except S3Error as e:
             logger.error(f"Error listing buckets in MinIO: {e}", exc_info=True)
@@ -108,22 +206,90 @@ class StorageService:
             logger.error(f"MinIO health check failed: {e}", exc_info=True)
             return False
 
+    async def _load_model_file(self, bucket_name: str, object_name: str, loader: Callable[[str], Any]) -> Any:
+        """Stream an object into a temp file and load it from there with loader (in a worker thread)"""
+        fd, path = tempfile.mkstemp(suffix=os.path.splitext(object_name)[1], dir=_MODEL_TMP_DIR)
+        os.close(fd)
+        try:
+            await asyncio.to_thread(_read_object, self.client, bucket_name, object_name, path)
+            return await asyncio.to_thread(loader, path)
+        finally:
+            # A memory-mapped model keeps its pages alive after the name is gone
+            os.unlink(path)
+
+    async def _load_bm25_model(self, bucket_name: str, bm25_object_name: str) -> Any:
+        """Memory-map an .npz BM25 model, falling back to its pickled .pkl sibling if missing"""
+        logger.info(f"Downloading BM25 model from '{bucket_name}/{bm25_object_name}'...")
+        original_object_name = bm25_object_name
+        bm25_model = None
+        if bm25_object_name.endswith(".npz"):
+            try:
+                bm25_model = await self._load_model_file(bucket_name, bm25_object_name, BM25Arrays.load)
+            except S3Error as e:
+                if e.code != "NoSuchKey":
+                    raise
+                bm25_object_name = bm25_object_name[:-4] + ".pkl"
+                logger.warning(f"No .npz BM25 model found, falling back to '{bm25_object_name}'")
+        if bm25_model is None:
+            bm25_model = await self._load_model_file(bucket_name, bm25_object_name, _unpickle_file)
+            if bm25_object_name != original_object_name:
+                await self._publish_bm25_arrays(bucket_name, original_object_name, bm25_model)
+        logger.info(f"✅ BM25 model loaded.")
+        return bm25_model
+
+    async def _publish_bm25_arrays(self, bucket_name: str, object_name: str, bm25_model: Any):
+        """Convert a pickled BM25Okapi model to the .npz layout and upload it, so later loads can map it"""
+        fd, path = tempfile.mkstemp(suffix=".npz", dir=_MODEL_TMP_DIR)
+        os.close(fd)
+        try:
+            await asyncio.to_thread(save_bm25_arrays, bm25_model, path)
+            with open(path, "rb") as f:
+                await self.upload_file(bucket_name, object_name, f, length=os.fstat(f.fileno()).st_size)
+            logger.info(f"Converted the pickled BM25 model to '{bucket_name}/{object_name}'")
+        except Exception as e:
+            logger.warning(f"Could not convert the BM25 model to .npz: {e}")
+        finally:
+            os.unlink(path)
+
+    async def _load_vocabulary(self, bucket_name: str, vocab_object_name: str) -> Dict:
+        logger.info(f"Downloading token_to_index from '{bucket_name}/{vocab_object_name}'...")
+        token_to_index_bytes = await self.download_file(bucket_name, vocab_object_name)
+        token_to_index = await asyncio.to_thread(json_loads, token_to_index_bytes)
+        logger.info(f"✅ token_to_index loaded.")
+        return token_to_index
+
     async def load_sparse_models(self, bucket_name: str, bm25_object_name: str, vocab_object_name: str) -> Tuple[Any, Dict]:
         """
         Loads the persisted BM25 model and token_to_index (vocabulary) from MinIO.
         Returns a tuple: (bm25_model, token_to_index).
+        Both objects are fetched concurrently, and the result is reused for SPARSE_MODEL_TTL seconds;
+        concurrent callers share one load.
         """
-        try:
-            logger.info(f"Downloading BM25 model from '{bucket_name}/{bm25_object_name}'...")
-            bm25_model_bytes = await self.download_file(bucket_name, bm25_object_name)
-            bm25_model = pickle.loads(bm25_model_bytes)
-            logger.info(f"✅ BM25 model loaded.")
+        key = (bucket_name, bm25_object_name, vocab_object_name)
+        cached = self._sparse_models.get(key)
+        if cached is not None and time.monotonic() - cached[0] < SPARSE_MODEL_TTL:
+            return cached[1]
+        load = self._sparse_model_loads.get(key)
+        if load is None:
+            load = asyncio.ensure_future(self._fetch_sparse_models(*key))
+            self._sparse_model_loads[key] = load
+            load.add_done_callback(functools.partial(self._sparse_models_loaded, key))
+        # Shielded, so a caller that goes away doesn't cancel the load the others are waiting on
+        return await asyncio.shield(load)
 
-            logger.info(f"Downloading token_to_index from '{bucket_name}/{vocab_object_name}'...")
-            token_to_index_bytes = await self.download_file(bucket_name, vocab_object_name)
-            token_to_index = json.loads(token_to_index_bytes.decode('utf-8'))
-            logger.info(f"✅ token_to_index loaded.")
+    def _sparse_models_loaded(self, key: tuple, load: asyncio.Task):
+        self._sparse_model_loads.pop(key, None)
+        if load.cancelled():
+            return
+        if load.exception() is None:  # also marks a failure retrieved when every caller had gone
+            self._sparse_models[key] = (time.monotonic(), load.result())
 
+    async def _fetch_sparse_models(self, bucket_name: str, bm25_object_name: str, vocab_object_name: str) -> Tuple[Any, Dict]:
+        try:
+            bm25_model, token_to_index = await asyncio.gather(
+                self._load_bm25_model(bucket_name, bm25_object_name),
+                self._load_vocabulary(bucket_name, vocab_object_name)
+            )
             return bm25_model, token_to_index
 
         except S3Error as e:
@@ -134,5 +300,7 @@ class StorageService:
             raise Exception(f"Failed to load sparse models from MinIO: {str(e)}")
 
 
-# Global instance
-storage_service = StorageService()
+@functools.lru_cache(maxsize=1)
+def get_storage_service() -> StorageService:
+    """The process-wide StorageService, created on first use"""
+    return StorageService()
@@ -2,15 +2,22 @@
 Vector Service for MVP
 Handles embeddings, dense search and sparse(BM25), and re-ranking using Qdrant and Cross-Encoder.
 """
+import copy
+import hashlib
 import logging
 import httpx
 import json
 import uuid
-from typing import List, Dict, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Optional, Tuple
 import asyncio
 import os
 import numpy as np # Import numpy
-from .storage_service import storage_service
+from .storage_service import get_storage_service
+from .http_clients import get_qdrant_client, close_qdrant_client
+from .batching import drain_batch
 import re
 
 # Conditional imports for sentence-transformers and CrossEncoder
@@ -21,151 +28,632 @@ except ImportError:
     SentenceTransformer = None
     CrossEncoder = None
 
-# Configure logging level to DEBUG for more detailed output during debugging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Incremental JSON parsing of large search responses; without it they are read whole and parsed at once
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    from .query_enhancer import enhance_search_query, get_enhancement_strategy, _normalize as normalize_query
+except ImportError:
+    enhance_search_query = None
+    get_enhancement_strategy = None
+    normalize_query = None
+
+# Request bodies carry embeddings as float32 ndarrays; orjson writes them without a .tolist() detour
+try:
+    import orjson
+
+    def json_dumps(obj, indent: bool = False) -> bytes:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj, indent: bool = False) -> bytes:
+        return json.dumps(obj, indent=2 if indent else None, default=lambda o: o.tolist()).encode()
+
+    json_loads = json.loads
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Handlers come from the application's logging setup (app_mvp routes records through a QueueHandler)
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG) # Set to DEBUG for more verbose output
+# Set VECTOR_SERVICE_LOG_LEVEL=DEBUG for per-search payload/response dumps
+logger.setLevel(os.getenv("VECTOR_SERVICE_LOG_LEVEL", "INFO").upper())
+
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+EMBEDDING_CACHE_SIZE = 10000
+# Micro-batching of concurrent encode calls: wait up to ENCODE_MAX_WAIT for up to ENCODE_BATCH_SIZE texts
+ENCODE_BATCH_SIZE = 32
+# Dynamically int8-quantized ONNX export shipped in the model repo; used on CPU when onnxruntime is installed
+EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "onnx/model_qint8_avx512.onnx")
+RERANKER_MODEL_NAME = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+RERANKER_ONNX_FILE = os.getenv("RERANKER_ONNX_FILE", "onnx/model_qint8_avx512_vnni.onnx")
+# Pairs are scored in length-sorted batches of this size, so each batch pads only to its own longest pair
+RERANK_BATCH_SIZE = 32
+# Reranking is skipped when Qdrant's top score beats the limit-th by more than this (the order is already clear)
+RERANK_SKIP_MARGIN = float(os.getenv("RERANK_SKIP_MARGIN", "0.15"))
+# Each ONNX predict already uses half the cores, so two concurrent reranks saturate the CPU
+RERANK_WORKERS = 2
+# Intra-op threads per CPU inference call (ONNX Runtime sessions and PyTorch), so that RERANK_WORKERS
+# concurrent calls fill the cores without oversubscribing them
+CPU_INFERENCE_THREADS = max(1, (os.cpu_count() or 2) // RERANK_WORKERS)
+ENCODE_MAX_WAIT = 0.005  # seconds
+ENHANCED_QUERY_CACHE_SIZE = 4096
+# MiniLM only reads its first 256 tokens (~1200 chars); longer input is cut here, before hashing and tokenizing
+EMBEDDING_MAX_CHARS = 4000
+# Collection layout: fp32 originals on disk, quantized copies in RAM for the HNSW search.
+# int8 scalar by default; binary (32x smaller) loses too much recall at MiniLM's 384 dimensions
+# to be the default, but can be chosen with QDRANT_QUANTIZATION=binary
+QUANTIZATION_CONFIGS = {
+    "scalar": {"scalar": {"type": "int8", "quantile": 0.99, "always_ram": True}},
+    "binary": {"binary": {"always_ram": True}},
+}
+QDRANT_QUANTIZATION = os.getenv("QDRANT_QUANTIZATION", "scalar").lower()
+if QDRANT_QUANTIZATION not in QUANTIZATION_CONFIGS:
+    logger.warning(f"Unknown QDRANT_QUANTIZATION {QDRANT_QUANTIZATION!r}; using scalar")
+    QDRANT_QUANTIZATION = "scalar"
+# Re-tuning an existing collection rebuilds its indexes, so it only happens when asked for
+QDRANT_APPLY_TUNING = os.getenv("QDRANT_APPLY_TUNING", "False").lower() == "true"
+HNSW_M = 16
+COLLECTION_TUNING = {
+    "hnsw_config": {"m": HNSW_M, "ef_construct": 128},
+    "quantization_config": QUANTIZATION_CONFIGS[QDRANT_QUANTIZATION],
+    "optimizers_config": {"memmap_threshold": 20000}
+}
+COLLECTION_CONFIG = {
+    "vectors": {"dense": {"size": 384, "distance": "Cosine", "on_disk": True}},
+    **COLLECTION_TUNING
+}
+
+# Search-time HNSW beam width; narrower for small result pages (latency mode)
+HNSW_EF = 128
+HNSW_EF_SMALL_LIMIT = 64
+# Search the quantized copies with 2x candidates, then rescore those against the fp32 originals
+QUANTIZATION_SEARCH_PARAMS = {"ignore": False, "rescore": True, "oversampling": 2.0}
+
+# Payload fields copied into each search result, with the default used when a field is absent
+# (`list` means a fresh empty list per result)
+RESULT_FIELDS = (
+    ("name", "Unknown"),
+    ("email_id", "Unknown"),
+    ("phone_number", "Unknown"),
+    ("location", "Unknown"),
+    ("skills", list),
+    ("experience_summary", ""),
+    ("qualifications_summary", ""),
+    ("companies_worked_with_duration", list),
+    ("current_job_title", ""),
+    ("objective", ""),
+    ("projects", list),
+    ("certifications", list),
+    ("awards_achievements", list),
+    ("languages", list),
+    ("linkedin_url", "Unknown"),
+    ("github_url", "Unknown"),
+    ("availability_status", None),
+    ("work_authorization_status", None),
+    ("has_photo", False),
+    ("_original_filename", ""),
+    ("personal_details", None),
+    ("personal_info", None),
+    ("_is_master_record", False),
+    ("_duplicate_group_id", None),
+    ("_duplicate_count", 0),
+    ("_associated_original_filenames", list),
+    ("_associated_ids", list),
+)
+# Searches return only the stored reranker text for their candidates; the mapped keys are then fetched
+# for the final hits alone.
+RERANK_PAYLOAD_SELECTOR = {"include": ["_rerank_text"]}
+RESULT_PAYLOAD_SELECTOR = {"include": [key for key, _ in RESULT_FIELDS]}
+# Keys _build_rerank_text reads, fetched for candidates stored before _rerank_text existed
+RERANK_SOURCE_SELECTOR = {"include": [
+    "current_job_title", "skills", "experience_summary", "objective", "qualifications_summary", "projects", "location"
+]}
+# Search responses at least this large (or of unknown length) are parsed incrementally when ijson is installed
+STREAM_PARSE_MIN_BYTES = 64 * 1024
+
+# Full document texts live in MinIO as <sha1>.txt; Qdrant payloads carry only the digest
+TEXT_BUCKET = "resume-texts"
+
+# Concurrent searches within SEARCH_MAX_WAIT go to Qdrant as one /points/search/batch request
+SEARCH_BATCH_SIZE = 32
+SEARCH_MAX_WAIT = 0.005  # seconds
+
+# Concurrent add_document calls within UPSERT_MAX_WAIT share one Qdrant upsert
+UPSERT_BATCH_SIZE = 256
+UPSERT_MAX_WAIT = 0.02  # seconds
+
+QUERY_TOKEN_PATTERN = re.compile(r'\b\w+\b')
+
+def _build_rerank_text(payload: Dict) -> str:
+    """Document side of the Cross-Encoder input for a resume payload"""
+    projects = payload.get('projects', [])
+    projects = [p for p in projects if isinstance(p, str)] if isinstance(projects, list) else []
+    # Extracted skills are not always strings (numbers, nulls); stringify and drop empty entries
+    skills = payload.get('skills') or []
+    skills = [str(s) for s in skills if s] if isinstance(skills, list) else []
+    return f"Title: {payload.get('current_job_title', '')}. " \
+           f"Skills: {', '.join(skills)}. " \
+           f"Experience: {payload.get('experience_summary', '')}. " \
+           f"Objective: {payload.get('objective', '')}. " \
+           f"Qualifications: {payload.get('qualifications_summary', '')}. " \
+           f"Projects: {', '.join(projects)}. " \
+           f"Location: {payload.get('location', '')}."
+
+
+class _AsyncByteReader:
+    """Async file-like view of an httpx byte stream, as read by ijson's async API"""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:  # ijson probes the stream type with read(0)
+            return b""
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
 
 class VectorService:
-    def __init__(self):
-        self.qdrant_url = os.getenv("QDRANT_URL", "http://157.180.44.51:6333")
-        self.collection_name = "employee_profiles"
+    def __init__(self, collection_name: str = "employee_profiles", qdrant_url: Optional[str] = None):
+        self.qdrant_url = qdrant_url or os.getenv("QDRANT_URL", "http://157.180.44.51:6333")
+        self.collection_name = collection_name
+        # Request URLs are fixed per instance; build them once instead of per call
+        self._collection_url = f"{self.qdrant_url}/collections/{collection_name}"
+        self._points_url = f"{self._collection_url}/points"
+        self._search_batch_url = f"{self._points_url}/search/batch"
         self.embedding_model = None  # For dense embeddings
         self.reranker_model = None   # For cross-encoder re-ranking
+        # Model loads run on a worker thread; concurrent first callers await the same load
+        self._model_loads: Dict[str, asyncio.Future] = {}
+        # (model name, blake2b(text)) -> embedding, most recently used last
+        self._embedding_cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        # (strategy, normalized query, job category) -> enhanced query, most recently used last
+        self._enhanced_queries: "OrderedDict[tuple, str]" = OrderedDict()
+        # In-flight searches by arguments, so concurrent identical searches share one pipeline run
+        self._inflight_searches: Dict[tuple, asyncio.Task] = {}
+        self._encode_queue: Optional[asyncio.Queue] = None
+        self._encode_task: Optional[asyncio.Task] = None
+        self._upsert_queue: Optional[asyncio.Queue] = None
+        self._upsert_task: Optional[asyncio.Task] = None
+        self._search_queue: Optional[asyncio.Queue] = None
+        self._search_task: Optional[asyncio.Task] = None
+        self._search_batches: set = set()  # in-flight batch requests, referenced until done
+        # Reranking runs here rather than in the default executor, which is sized for I/O
+        self._rerank_pool = ThreadPoolExecutor(max_workers=RERANK_WORKERS, thread_name_prefix="rerank")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled keep-alive client shared by every VectorService instance"""
+        return get_qdrant_client()
+
+    async def aclose(self):
+        """Close the shared Qdrant client; call on application shutdown"""
+        await close_qdrant_client()
 
     async def initialize_collections(self):
-        """Initialize Qdrant collections. Checks if collection exists."""
+        """
+        Initialize Qdrant collections: create the collection with COLLECTION_CONFIG if missing.
+        With QDRANT_APPLY_TUNING=true, also apply COLLECTION_TUNING to an existing collection
+        whose quantization type differs.
+        """
+        collection_url = self._collection_url
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.qdrant_url}/collections/{self.collection_name}")
+            response = await self.client.get(collection_url)
+            if response.status_code == 200:
+                logger.info(f"Qdrant collection {self.collection_name} already exists")
+                if not QDRANT_APPLY_TUNING:
+                    return
+                config = json_loads(response.content).get("result", {}).get("config", {})
+                if (config.get("quantization_config") or {}).keys() != COLLECTION_TUNING["quantization_config"].keys():
+                    response = await self.client.patch(collection_url, content=json_dumps(COLLECTION_TUNING), headers=JSON_HEADERS)
+                    logger.info(f"Enabled {QDRANT_QUANTIZATION} quantization on {self.collection_name}: {response.status_code}")
+            else:
+                response = await self.client.put(collection_url, content=json_dumps(COLLECTION_CONFIG), headers=JSON_HEADERS)
                 if response.status_code == 200:
-                    logger.info(f"Qdrant collection {self.collection_name} already exists")
+                    logger.info(f"Created Qdrant collection {self.collection_name}")
                 else:
-                    logger.info(f"Note: {self.collection_name} collection not found on the server. It should be pre-created.")
+                    logger.error(f"Failed to create {self.collection_name}: {response.text}")
         except Exception as e:
             logger.error(f"Failed to initialize Qdrant collections: {e}")
 
+    async def set_bulk_ingest_mode(self, enabled: bool):
+        """Pause HNSW graph building (m=0) during bulk uploads; restore it afterwards to index once."""
+        response = await self.client.patch(
+            self._collection_url,
+            content=json_dumps({"hnsw_config": {"m": 0 if enabled else HNSW_M}}),
+            headers=JSON_HEADERS
+        )
+        if response.status_code != 200:
+            logger.error(f"Failed to update HNSW config: {response.text}")
+
+    async def _load_model(self, name: str, loader):
+        """Run a blocking model loader on a worker thread, once however many callers are waiting"""
+        load = self._model_loads.get(name)
+        if load is None:
+            load = self._model_loads[name] = asyncio.ensure_future(asyncio.to_thread(loader))
+        return await asyncio.shield(load)
+
     async def get_embedding_model(self):
         """Get or initialize the dense embedding model."""
         if self.embedding_model is None:
-            if SentenceTransformer:
-                try:
-                    self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-                    logger.info("Loaded dense embedding model: all-MiniLM-L6-v2")
-                except Exception as e:
-                    logger.warning(f"Failed to load SentenceTransformer: {e}. Using mock embeddings.")
-                    self.embedding_model = "mock"
-            else:
-                self.embedding_model = "mock"
+            self.embedding_model = await self._load_model("embedding", self._load_embedding_model)
         return self.embedding_model
 
+    def _load_embedding_model(self):
+        if not SentenceTransformer:
+            return "mock"
+        try:
+            import torch
+            if torch.cuda.is_available():
+                # Half precision halves memory traffic on GPU; CPU kernels stay fp32
+                model = SentenceTransformer(
+                    EMBEDDING_MODEL_NAME, device="cuda", model_kwargs={"torch_dtype": torch.float16}
+                )
+            else:
+                torch.set_num_threads(CPU_INFERENCE_THREADS)
+                model = self._load_onnx_model() or SentenceTransformer(EMBEDDING_MODEL_NAME, device="cpu")
+            logger.info(f"Loaded dense embedding model: {EMBEDDING_MODEL_NAME} on {model.device}")
+            return model
+        except Exception as e:
+            logger.warning(f"Failed to load SentenceTransformer: {e}. Using mock embeddings.")
+            return "mock"
+
+    @staticmethod
+    def _onnx_model_kwargs(file_name: str) -> Dict:
+        """model_kwargs for loading an ONNX Runtime export of a model on CPU (raises ImportError without onnxruntime)"""
+        import onnxruntime
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = CPU_INFERENCE_THREADS
+        return {"file_name": file_name, "provider": "CPUExecutionProvider", "session_options": session_options}
+
+    @classmethod
+    def _load_onnx_model(cls):
+        """int8 ONNX Runtime variant of the embedding model, or None if the ONNX backend is unavailable"""
+        try:
+            return SentenceTransformer(
+                EMBEDDING_MODEL_NAME, backend="onnx", model_kwargs=cls._onnx_model_kwargs(EMBEDDING_ONNX_FILE)
+            )
+        except Exception as e:
+            logger.info(f"ONNX embedding backend unavailable ({e}); using PyTorch.")
+            return None
+
+    @classmethod
+    def _load_onnx_reranker(cls):
+        """int8 ONNX Runtime variant of the Cross-Encoder, or None if the ONNX backend is unavailable"""
+        try:
+            return CrossEncoder(
+                RERANKER_MODEL_NAME, backend="onnx", model_kwargs=cls._onnx_model_kwargs(RERANKER_ONNX_FILE)
+            )
+        except Exception as e:
+            logger.info(f"ONNX reranker backend unavailable ({e}); using PyTorch.")
+            return None
+
     async def get_reranker_model(self):
         """Get or initialize the Cross-Encoder re-ranking model."""
         if self.reranker_model is None:
-            if CrossEncoder:
-                try:
-                    self.reranker_model = CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2")
-                    logger.info("Loaded Cross-Encoder reranker: cross-encoder/ms-marco-MiniLM-L-6-v2")
-                except Exception as e:
-                    logger.warning(f"Failed to load CrossEncoder: {e}. Re-ranking will be skipped.")
-                    self.reranker_model = "mock"
-            else:
-                self.reranker_model = "mock"
+            self.reranker_model = await self._load_model("reranker", self._load_reranker_model)
         return self.reranker_model
 
-    async def create_dense_embedding(self, text: str) -> List[float]:
-        """Create dense embedding for text."""
+    def _load_reranker_model(self):
+        if not CrossEncoder:
+            return "mock"
+        try:
+            import torch
+            if torch.cuda.is_available():
+                model = CrossEncoder(RERANKER_MODEL_NAME, device="cuda")
+            else:
+                torch.set_num_threads(CPU_INFERENCE_THREADS)
+                model = self._load_onnx_reranker() or CrossEncoder(RERANKER_MODEL_NAME, device="cpu")
+            logger.info(f"Loaded Cross-Encoder reranker: {RERANKER_MODEL_NAME}")
+            return model
+        except Exception as e:
+            logger.warning(f"Failed to load CrossEncoder: {e}. Re-ranking will be skipped.")
+            return "mock"
+
+    async def warmup(self):
+        """Load the models (on worker threads) and run them once per encode batch size, and open a
+        Qdrant connection, so the first requests don't pay for model loading and first-call setup."""
+        try:
+            model = await self.get_embedding_model()
+            if model != "mock":
+                for batch_size in (1, 2, 4, 8, 16, 32):
+                    await asyncio.to_thread(model.encode, ["warmup"] * batch_size, batch_size=batch_size)
+            reranker = await self.get_reranker_model()
+            if reranker != "mock":
+                await asyncio.to_thread(reranker.predict, [("warmup", "warmup")])
+            logger.info("Vector models warmed up")
+        except Exception as e:
+            logger.warning(f"Vector model warmup failed: {e}")
+        try:
+            await self.client.get(f"{self.qdrant_url}/collections")
+        except Exception as e:
+            logger.warning(f"Could not open a Qdrant connection during warmup: {e}")
+
+    async def create_dense_embedding(self, text: str) -> np.ndarray:
+        """Create dense float32 embedding for text (cached by content hash; read-only)."""
+        # MiniLM's tokenizer is uncased and splits on whitespace, so case/spacing variants embed identically;
+        # normalizing first lets them share one cache entry
+        text = " ".join(text[:EMBEDDING_MAX_CHARS].lower().split())
         try:
             model = await self.get_embedding_model()
+            cache_key = (
+                "mock" if model == "mock" else EMBEDDING_MODEL_NAME,
+                hashlib.blake2b(text.encode()).digest()
+            )
+            cached = self._embedding_cache.get(cache_key)
+            if cached is not None:
+                self._embedding_cache.move_to_end(cache_key)
+                return cached
             if model == "mock":
-                # Deterministic mock embedding for testing (384 dimensions)
-                import hashlib
-                import struct
-                text_hash = hashlib.md5(text.encode()).digest()
-                embedding = []
-                for i in range(0, len(text_hash), 4):
-                    chunk = text_hash[i:i+4]
-                    if len(chunk) == 4:
-                        val = struct.unpack('f', chunk)[0]
-                        embedding.append(val)
-                while len(embedding) < 384:
-                    embedding.extend(embedding[:min(len(embedding), 384 - len(embedding))])
-                return embedding[:384]
+                embedding = self._mock_embedding(text)
             else:
-                embedding = model.encode(text)
-                return embedding.tolist()
+                embedding = await self._encode_batched(text)
+            embedding.setflags(write=False)  # shared through the cache
+            self._embedding_cache[cache_key] = embedding
+            if len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+                self._embedding_cache.popitem(last=False)
+            return embedding
         except Exception as e:
             logger.error(f"Dense embedding creation failed: {e}")
-            return [0.0] * 384 # Return zero vector as fallback
+            return np.zeros(384, dtype=np.float32) # Return zero vector as fallback
+
+    @staticmethod
+    def _mock_embedding(text: str) -> np.ndarray:
+        # Deterministic mock embedding for testing: the 4 float32s of the MD5 digest tiled to 384 dimensions.
+        # Random bit patterns can decode to NaN/inf, which JSON can't carry, so those become 0.
+        digest = np.frombuffer(hashlib.md5(text.encode()).digest(), dtype='<f4')
+        return np.nan_to_num(np.tile(digest, 384 // digest.size), nan=0.0, posinf=0.0, neginf=0.0)
+
+    async def _encode_batched(self, text: str) -> np.ndarray:
+        """Queue text for the encode loop, which runs concurrent requests through one model.encode call"""
+        loop = asyncio.get_running_loop()
+        if self._encode_task is None or self._encode_task.done() or self._encode_task.get_loop() is not loop:
+            self._encode_queue = asyncio.Queue()
+            self._encode_task = loop.create_task(self._encode_loop())
+        future = loop.create_future()
+        await self._encode_queue.put((text, future))
+        return await future
+
+    async def _encode_loop(self):
+        while True:
+            batch = await drain_batch(self._encode_queue, ENCODE_BATCH_SIZE, ENCODE_MAX_WAIT)
+            try:
+                vectors = await asyncio.to_thread(
+                    self.embedding_model.encode, [text for text, _ in batch], batch_size=ENCODE_BATCH_SIZE,
+                    convert_to_numpy=True, normalize_embeddings=True
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            # Unit-length fp32 (Qdrant's vector type), whatever precision the model ran in
+            vectors = vectors.astype(np.float32, copy=False)
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector.copy())  # don't pin the whole batch array
+
+    @staticmethod
+    def _build_point(text: str, text_sha1: Optional[str], metadata: Dict, embedding: np.ndarray) -> Dict:
+        # u64 point ids are 8 bytes in Qdrant's id map versus 16 for UUIDs; the UUID stays in the payload
+        external_id = uuid.uuid4()
+        payload = {
+            **metadata,
+            "external_id": str(external_id),
+            "text_length": len(text),
+            "_rerank_text": _build_rerank_text(metadata)  # built once here instead of on every search
+        }
+        if text_sha1 is not None:
+            payload["text_sha1"] = text_sha1  # full text is in TEXT_BUCKET; see get_text_by_id
+        else:
+            payload["text_content"] = text  # TEXT_BUCKET was unavailable, so the text stays inline
+        return {
+            "id": external_id.int >> 64,
+            "vector": {"dense": embedding},  # named vector, as declared in COLLECTION_CONFIG and searched
+            "payload": payload
+        }
+
+    @staticmethod
+    async def _store_text(text: str) -> Optional[str]:
+        """
+        Store the full document text in TEXT_BUCKET under its SHA-1 (idempotent) and return the digest,
+        or None if MinIO is unavailable (indexing then keeps the text in the Qdrant payload)
+        """
+        data = text.encode()
+        text_sha1 = hashlib.sha1(data).hexdigest()
+        try:
+            await get_storage_service().upload_file(TEXT_BUCKET, f"{text_sha1}.txt", data)
+        except Exception as e:
+            logger.warning(f"Could not store document text in MinIO, keeping it in the payload: {e}")
+            return None
+        return text_sha1
+
+    async def _upsert_points(self, points: List[Dict], wait: bool = False):
+        response = await self.client.put(
+            self._points_url,
+            params={"wait": "true" if wait else "false"},
+            content=json_dumps({"points": points}),
+            headers=JSON_HEADERS
+        )
+        if response.status_code != 200:
+            logger.error(f"Failed to add documents to vector DB: {response.text}")
+            raise Exception(f"Vector DB insertion failed: {response.text}")
 
     async def add_document(self, text: str, metadata: Dict) -> str:
-        """Add document to vector database with dense embedding."""
+        """Add document to vector database with dense embedding (upserted together with concurrent adds)."""
         try:
-            # Create dense embedding
-            embedding = await self.create_dense_embedding(text)
+            embedding, text_sha1 = await asyncio.gather(self.create_dense_embedding(text), self._store_text(text))
+            point = self._build_point(text, text_sha1, metadata, embedding)
             
-            # Generate unique ID
-            doc_id = str(uuid.uuid4())
-            
-            # Prepare point for Qdrant
-            point = {
-                "id": doc_id,
-                "vector": embedding, # Store dense vector directly (unnamed vector)
-                "payload": {
-                    **metadata,
-                    "text_content": text[:1000],  # Store first 1000 chars of original text
-                    "text_length": len(text)
-                }
-            }
+            loop = asyncio.get_running_loop()
+            if self._upsert_task is None or self._upsert_task.done() or self._upsert_task.get_loop() is not loop:
+                self._upsert_queue = asyncio.Queue()
+                self._upsert_task = loop.create_task(self._upsert_loop())
+            future = loop.create_future()
+            await self._upsert_queue.put((point, future))
+            await future
             
-            # Insert into Qdrant
-            async with httpx.AsyncClient() as client:
-                response = await client.put(
-                    f"{self.qdrant_url}/collections/{self.collection_name}/points",
-                    json={
-                        "points": [point]
-                    }
-                )
-                if response.status_code == 200:
-                    logger.info(f"Added document to vector DB: {doc_id}")
-                    return doc_id
-                else:
-                    logger.error(f"Failed to add document to vector DB: {response.text}")
-                    raise Exception(f"Vector DB insertion failed: {response.text}")
+            logger.debug("Added document to vector DB: %s", point["id"])
+            return str(point["id"])
         except Exception as e:
             logger.error(f"Document addition failed: {e}")
             raise Exception(f"Vector DB error: {str(e)}")
 
+    async def _upsert_loop(self):
+        while True:
+            batch = await drain_batch(self._upsert_queue, UPSERT_BATCH_SIZE, UPSERT_MAX_WAIT)
+            try:
+                await self._upsert_points([point for point, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    async def add_documents_bulk(self, items: List[Tuple[str, Dict]], wait: bool = False) -> List[str]:
+        """Embed and upsert many (text, metadata) documents in a single Qdrant request."""
+        embeddings, digests = await asyncio.gather(
+            asyncio.gather(*(self.create_dense_embedding(text) for text, _ in items)),
+            asyncio.gather(*(self._store_text(text) for text, _ in items))
+        )
+        points = [
+            self._build_point(text, text_sha1, metadata, embedding)
+            for (text, metadata), text_sha1, embedding in zip(items, digests, embeddings)
+        ]
+        try:
+            await self._upsert_points(points, wait=wait)
+        except Exception as e:
+            logger.error(f"Bulk document addition failed: {e}")
+            raise Exception(f"Vector DB error: {str(e)}")
+        logger.info(f"Added {len(points)} documents to vector DB")
+        return [str(point["id"]) for point in points]
+
+    async def _search_batched(self, search_request: Dict) -> List[Dict]:
+        """Queue a search for the search loop, which sends concurrent searches as one batch request"""
+        loop = asyncio.get_running_loop()
+        if self._search_task is None or self._search_task.done() or self._search_task.get_loop() is not loop:
+            self._search_queue = asyncio.Queue()
+            self._search_task = loop.create_task(self._search_loop())
+        future = loop.create_future()
+        await self._search_queue.put((search_request, future))
+        return await future
+
+    async def _search_loop(self):
+        while True:
+            batch = await drain_batch(self._search_queue, SEARCH_BATCH_SIZE, SEARCH_MAX_WAIT)
+            # Send without waiting for earlier batches, so a slow batch doesn't hold up the next
+            task = asyncio.get_running_loop().create_task(self._run_search_batch(batch))
+            self._search_batches.add(task)
+            task.add_done_callback(self._search_batches.discard)
+
+    async def _run_search_batch(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        try:
+            results = await self._post_search_batch([request for request, _ in batch])
+            if len(results) != len(batch):
+                raise Exception(f"Qdrant returned {len(results)} result lists for {len(batch)} searches")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), hits in zip(batch, results):
+            if not future.done():
+                future.set_result(hits)
+
+    async def _post_search_batch(self, searches: List[Dict]) -> List[List[Dict]]:
+        async with self.client.stream(
+            "POST", self._search_batch_url, content=json_dumps({"searches": searches}), headers=JSON_HEADERS
+        ) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise Exception(f"Vector DB search failed: {response.text}")
+            content_length = int(response.headers.get("content-length", 0))
+            if ijson is not None and (content_length == 0 or content_length >= STREAM_PARSE_MIN_BYTES):
+                # Parsed chunk by chunk, so the raw body is never held in full next to the parsed one
+                hit_lists = ijson.items(_AsyncByteReader(response.aiter_bytes()), "result.item", use_float=True)
+                return [hits async for hits in hit_lists]
+            return json_loads(await response.aread()).get("result", [])
+
+    async def _enhance_query(self, query_text: str, job_category: Optional[str]) -> str:
+        """Enhanced form of a search query, memoized per (strategy, normalized query, category)"""
+        if enhance_search_query is None:
+            logger.info("Query enhancer not available, using original query.")
+            return query_text
+
+        # Same normalization as the enhancer's own cache, so both layers agree on what is a repeat
+        cache_key = (get_enhancement_strategy(), normalize_query(query_text), job_category)
+        cached = self._enhanced_queries.get(cache_key)
+        if cached is not None:
+            self._enhanced_queries.move_to_end(cache_key)
+            return cached
+
+        try:
+            context = {"job_category": job_category} if job_category else None
+            final_query = await enhance_search_query(query_text, context)
+        except Exception as e:
+            logger.warning(f"Query enhancement failed: {e}, using original query.")
+            return query_text
+
+        # Enhancers fall back to the original query when they fail (open circuit breaker, API error);
+        # caching that would pin the unenhanced form for the life of the process
+        if final_query == query_text:
+            return final_query
+        logger.debug("Query enhanced: %r -> %r", query_text, final_query)
+        self._enhanced_queries[cache_key] = final_query
+        if len(self._enhanced_queries) > ENHANCED_QUERY_CACHE_SIZE:
+            self._enhanced_queries.popitem(last=False)
+        return final_query
+
     async def search_resumes(self, query_text: str, job_category: Optional[str] = None, 
                            limit: int = 10, similarity_threshold: float = 0.7,
                            initial_retrieval_limit: int = 40,
                            enhance_query: bool = True) -> List[Dict]:
+        key = (query_text, job_category, limit, similarity_threshold, initial_retrieval_limit, enhance_query)
+        search = self._inflight_searches.get(key)
+        if search is None:
+            search = asyncio.ensure_future(self._search_resumes(*key))
+            self._inflight_searches[key] = search
+            search.add_done_callback(partial(self._search_finished, key))
+        # Shielded, so a caller that goes away doesn't cancel the run the others are waiting on.
+        # Callers annotate result rows in place, so each one gets its own copies.
+        return copy.deepcopy(await asyncio.shield(search))
+
+    def _search_finished(self, key: tuple, search: asyncio.Task):
+        self._inflight_searches.pop(key, None)
+        if not search.cancelled():
+            search.exception()  # mark retrieved when every caller had gone
+
+    async def _search_resumes(self, query_text: str, job_category: Optional[str],
+                              limit: int, similarity_threshold: float,
+                              initial_retrieval_limit: int, enhance_query: bool) -> List[Dict]:
         try:
-            logger.info(f"Search request: query='{query_text}', category='{job_category}', final_limit={limit}, initial_limit={initial_retrieval_limit}, threshold={similarity_threshold}")
+            logger.debug("Search request: query=%r, category=%r, final_limit=%d, initial_limit=%d, threshold=%s",
+                         query_text, job_category, limit, initial_retrieval_limit, similarity_threshold)
             
             final_query = query_text
             if enhance_query:
-                try:
-                    from .query_enhancer import enhance_search_query
-                    context = {"job_category": job_category} if job_category else None
-                    final_query = await enhance_search_query(query_text, context)
-                    if final_query != query_text:
-                        logger.info(f"Query enhanced: '{query_text}' -> '{final_query}'")
-                except ImportError:
-                    logger.info("Query enhancer not available, using original query.")
-                except Exception as e:
-                    logger.warning(f"Query enhancement failed: {e}, using original query.")
+                final_query = await self._enhance_query(query_text, job_category)
 
             dense_query_embedding = await self.create_dense_embedding(final_query)
-            logger.info(f"Dense query embedding created, length: {len(dense_query_embedding)}")
+            logger.debug("Dense query embedding created, length: %d", len(dense_query_embedding))
 
             # ------------------ Load sparse model via storage service ------------------
         
-            bm25_model, token_to_index = await storage_service.load_sparse_models(
-                "vector-service-models", "bm25_model.pkl", "token_to_index.json"
+            bm25_model, token_to_index = await get_storage_service().load_sparse_models(
+                "vector-service-models", "bm25_model.npz", "token_to_index.json"
             )
 
-            query_tokens = re.findall(r'\b\w+\b', final_query.lower())
+            query_tokens = QUERY_TOKEN_PATTERN.findall(final_query.lower())
             bm25_scores = bm25_model.get_scores(query_tokens)
 
             sparse_indices = []
@@ -175,6 +663,9 @@ class VectorService:
                     sparse_indices.append(token_to_index[token])
                     sparse_values.append(float(score))
 
+            reranker = await self.get_reranker_model()
+            use_reranker = reranker is not None and reranker != "mock"
+
             search_request = {
                 "vector": {
                     "name": "dense",  # refers to vector name in collection config
@@ -186,7 +677,12 @@ class VectorService:
                 },
                 "limit": initial_retrieval_limit,
                 "score_threshold": similarity_threshold,
-                "with_payload": True,
+                "params": {
+                    "hnsw_ef": max(HNSW_EF_SMALL_LIMIT if limit <= 10 else HNSW_EF, initial_retrieval_limit),
+                    "exact": False,
+                    "quantization": QUANTIZATION_SEARCH_PARAMS
+                },
+                "with_payload": RERANK_PAYLOAD_SELECTOR if use_reranker else False,
                 "with_vector": False
             }
 
@@ -202,115 +698,89 @@ class VectorService:
                     ]
                 }
 
-            logger.info(f"Qdrant search request payload: {json.dumps(search_request, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Qdrant search request payload: %s", json_dumps(search_request, indent=True).decode())
 
             initial_qdrant_results = []
-            async with httpx.AsyncClient() as client:
-                logger.info(f"Searching in {self.collection_name} collection with initial limit {initial_retrieval_limit}")
-                response = await client.post(
-                    f"{self.qdrant_url}/collections/{self.collection_name}/points/search",
-                    json=search_request
-                )
-                if response.status_code == 200:
-                    response_data = response.json()
-                    logger.debug(f"Raw Qdrant response data: {json.dumps(response_data, indent=2)}")
-                    initial_qdrant_results = response_data.get("result", [])
-                    logger.info(f"Found {len(initial_qdrant_results)} initial results from Qdrant.")
-                else:
-                    logger.error(f"Error searching {self.collection_name}: {response.text}")
-                    return []
+            logger.debug("Searching in %s collection with initial limit %d", self.collection_name, initial_retrieval_limit)
+            try:
+                initial_qdrant_results = await self._search_batched(search_request)
+            except Exception as e:
+                logger.error(f"Error searching {self.collection_name}: {e}")
+                return []
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Qdrant search results: %s", json_dumps(initial_qdrant_results, indent=True).decode())
+            logger.debug("Found %d initial results from Qdrant.", len(initial_qdrant_results))
 
-            final_results = []
-            reranker = await self.get_reranker_model()
+            reranker_scores = {}  # id(result) -> sigmoid of the Cross-Encoder logit, for the reranked results kept
+
+            if use_reranker and initial_qdrant_results:
+                score_gap = initial_qdrant_results[0].get("score", 0.0) - \
+                    initial_qdrant_results[min(limit, len(initial_qdrant_results)) - 1].get("score", 0.0)
+                if score_gap > RERANK_SKIP_MARGIN:
+                    logger.debug("Top-%d score gap %.3f is decisive; keeping Qdrant order.", limit, score_gap)
+                    use_reranker = False
 
-            if reranker and initial_qdrant_results:
-                logger.info("Performing re-ranking with Cross-Encoder...")
-                rerank_pairs = []
+            if use_reranker and initial_qdrant_results:
+                logger.debug("Performing re-ranking with Cross-Encoder...")
                 valid_initial_qdrant_results = []
                 for result in initial_qdrant_results:
                     if not isinstance(result, dict):
                         logger.error(f"Unexpected item type in initial_qdrant_results: {type(result)}. Skipping.")
                         continue
                     valid_initial_qdrant_results.append(result)
-                    payload = result.get("payload", {})
-
-                    projects_list_for_reranker = []
-                    projects_data = payload.get('projects', [])
-                    if isinstance(projects_data, list):
-                        for p_item in projects_data:
-                            if isinstance(p_item, str):
-                                projects_list_for_reranker.append(p_item)
-                    doc_text = f"Title: {payload.get('current_job_title', '')}. " \
-                               f"Skills: {', '.join(payload.get('skills', []))}. " \
-                               f"Experience: {payload.get('experience_summary', '')}. " \
-                               f"Objective: {payload.get('objective', '')}. " \
-                               f"Qualifications: {payload.get('qualifications_summary', '')}. " \
-                               f"Projects: {', '.join(projects_list_for_reranker)}. " \
-                               f"Location: {payload.get('location', '')}."
-                    rerank_pairs.append((final_query, doc_text))
+
+                # Points stored before _rerank_text existed get it built from their payload
+                legacy = [r for r in valid_initial_qdrant_results if not (r.get("payload") or {}).get("_rerank_text")]
+                if legacy:
+                    legacy_payloads = await self._retrieve_payloads([r["id"] for r in legacy], RERANK_SOURCE_SELECTOR)
+                    for result in legacy:
+                        result["payload"] = {"_rerank_text": _build_rerank_text(legacy_payloads.get(result["id"], {}))}
+                rerank_pairs = [(final_query, r["payload"]["_rerank_text"]) for r in valid_initial_qdrant_results]
 
                 if rerank_pairs:
-                    scores = reranker.predict(rerank_pairs)
-                    if len(scores) == len(valid_initial_qdrant_results):
-                        scored_results = sorted(zip(scores, valid_initial_qdrant_results), key=lambda x: x[0], reverse=True)
-                        final_results_for_mapping = [item[1] for item in scored_results[:limit]]
+                    order = sorted(range(len(rerank_pairs)), key=lambda i: len(rerank_pairs[i][0]) + len(rerank_pairs[i][1]))
+                    sorted_scores = await asyncio.get_running_loop().run_in_executor(self._rerank_pool, partial(
+                        reranker.predict, [rerank_pairs[i] for i in order], batch_size=RERANK_BATCH_SIZE,
+                        convert_to_numpy=True, show_progress_bar=False
+                    ))
+                    if len(sorted_scores) == len(valid_initial_qdrant_results):
+                        scores = np.empty(len(order), dtype=np.float32)
+                        scores[order] = sorted_scores  # back to candidate order
+                        top = np.argsort(-scores, kind="stable")[:limit]
+                        final_results_for_mapping = [valid_initial_qdrant_results[i] for i in top.tolist()]
+                        # The Cross-Encoder returns logits; the sigmoid puts them on the same 0-1 scale as
+                        # Qdrant's cosine scores, which callers show as percentages.
+                        # One bulk conversion to Python floats for the kept scores.
+                        probabilities = 1.0 / (1.0 + np.exp(-scores[top]))
+                        reranker_scores = dict(zip(map(id, final_results_for_mapping), probabilities.tolist()))
                     else:
                         logger.error("Mismatch between reranker scores and initial results.")
                         final_results_for_mapping = valid_initial_qdrant_results[:limit]
                 else:
                     final_results_for_mapping = valid_initial_qdrant_results[:limit]
             else:
-                logger.warning("Skipping reranking.")
+                logger.debug("Skipping reranking.")
                 final_results_for_mapping = [r for r in initial_qdrant_results if isinstance(r, dict)][:limit]
 
+            result_payloads = await self._retrieve_payloads(
+                [r["id"] for r in final_results_for_mapping], RESULT_PAYLOAD_SELECTOR
+            )
             results_to_return = []
             for result in final_results_for_mapping:
-                if not isinstance(result, dict):
-                    continue
-                payload = result.get("payload", {})
-                reranker_score = None
-                if 'scored_results' in locals():
-                    for s, r in scored_results:
-                        if r.get('id') == result.get('id'):
-                            reranker_score = s
-                            break
-                similarity_score = reranker_score if reranker_score is not None else result.get("score", 0.0)
-                if isinstance(similarity_score, np.float32):
-                    similarity_score = float(similarity_score)
-
-                results_to_return.append({
-                    "id": result["id"],
-                    "similarity_score": similarity_score,
-                    "collection": self.collection_name,
-                    "name": payload.get("name", "Unknown"),
-                    "email_id": payload.get("email_id", "Unknown"),
-                    "phone_number": payload.get("phone_number", "Unknown"),
-                    "location": payload.get("location", "Unknown"),
-                    "skills": payload.get("skills", []),
-                    "experience_summary": payload.get("experience_summary", ""),
-                    "qualifications_summary": payload.get("qualifications_summary", ""),
-                    "companies_worked_with_duration": payload.get("companies_worked_with_duration", []),
-                    "current_job_title": payload.get("current_job_title", ""),
-                    "objective": payload.get("objective", ""),
-                    "projects": payload.get("projects", []),
-                    "certifications": payload.get("certifications", []),
-                    "awards_achievements": payload.get("awards_achievements", []),
-                    "languages": payload.get("languages", []),
-                    "linkedin_url": payload.get("linkedin_url", "Unknown"),
-                    "github_url": payload.get("github_url", "Unknown"),
-                    "availability_status": payload.get("availability_status"),
-                    "work_authorization_status": payload.get("work_authorization_status"),
-                    "has_photo": payload.get("has_photo", False),
-                    "_original_filename": payload.get("_original_filename", ""),
-                    "personal_details": payload.get("personal_details"),
-                    "personal_info": payload.get("personal_info"),
-                    "_is_master_record": payload.get("_is_master_record", False),
-                    "_duplicate_group_id": payload.get("_duplicate_group_id"),
-                    "_duplicate_count": payload.get("_duplicate_count", 0),
-                    "_associated_original_filenames": payload.get("_associated_original_filenames", []),
-                    "_associated_ids": payload.get("_associated_ids", [])
-                })
-            logger.info(f"Returning {len(results_to_return)} final results after re-ranking.")
+                payload = result_payloads.get(result["id"], {})
+                if id(result) in reranker_scores:
+                    similarity_score, score_source = reranker_scores[id(result)], "rerank"
+                else:
+                    similarity_score, score_source = result.get("score", 0.0), "vector"
+
+                # Ids go out as strings: u64 ids overflow JavaScript numbers, and callers match them against form input
+                row = {"id": str(result["id"]), "similarity_score": similarity_score, "score_source": score_source,
+                       "collection": self.collection_name}
+                for key, default in RESULT_FIELDS:
+                    row[key] = payload[key] if key in payload else (default() if default is list else default)
+                results_to_return.append(row)
+            logger.info("Search ok: category=%s, results=%d", job_category, len(results_to_return))
             return results_to_return
 
         except Exception as e:
@@ -318,68 +788,67 @@ class VectorService:
             return []
 
 
+    async def _retrieve_payloads(self, point_ids: List, selector: Dict) -> Dict:
+        """Payloads (restricted by selector) of the given points, keyed by point id"""
+        if not point_ids:
+            return {}
+        response = await self.client.post(
+            self._points_url,
+            content=json_dumps({"ids": point_ids, "with_payload": selector, "with_vector": False}),
+            headers=JSON_HEADERS
+        )
+        if response.status_code != 200:
+            raise Exception(f"Vector DB retrieve failed: {response.text}")
+        return {point["id"]: point.get("payload") or {} for point in json_loads(response.content).get("result", [])}
+
+    async def get_text_by_id(self, point_id: str) -> Optional[str]:
+        """Full text of a stored document, or None if the point does not exist"""
+        point_id = int(point_id) if point_id.isdigit() else point_id
+        payloads = await self._retrieve_payloads([point_id], {"include": ["text_sha1", "text_content"]})
+        if not payloads:
+            return None
+        payload = next(iter(payloads.values()))
+        if "text_sha1" not in payload:
+            # Points stored before texts moved to MinIO kept a 1000-char prefix; ones stored while
+            # MinIO was down keep the whole text
+            return payload.get("text_content")
+        data = await get_storage_service().download_file(TEXT_BUCKET, f"{payload['text_sha1']}.txt")
+        return data.decode()
+
     async def health_check(self) -> bool:
         """Check Qdrant health."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.qdrant_url}/collections")
-                if response.status_code == 200:
-                    collections = response.json()
-                    collection_names = [col["name"] for col in collections.get("result", {}).get("collections", [])]
-                    logger.info(f"Available Qdrant collections: {collection_names}")
-                    if self.collection_name in collection_names:
-                        logger.info(f"Collection {self.collection_name} is available")
-                    else:
-                        logger.warning(f"Collection {self.collection_name} is NOT available")
-                return response.status_code == 200
+            response = await self.client.get(f"{self.qdrant_url}/collections")
+            if response.status_code == 200:
+                collections = json_loads(response.content)
+                collection_names = [col["name"] for col in collections.get("result", {}).get("collections", [])]
+                logger.info(f"Available Qdrant collections: {collection_names}")
+                if self.collection_name in collection_names:
+                    logger.info(f"Collection {self.collection_name} is available")
+                else:
+                    logger.warning(f"Collection {self.collection_name} is NOT available")
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Qdrant health check failed: {e}")
             return False
 
     async def get_collection_stats(self) -> Dict:
-        """Get statistics for the employee_profiles collection, including point count."""
+        """Get statistics for this service's collection, including point count."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.qdrant_url}/collections/{self.collection_name}/points")
-                if response.status_code == 200:
-                    data = response.json()
-                    point_count = data.get("result", {}).get("points_count", 0)
-                    return {
-                        "collection_name": self.collection_name,
-                        "point_count": point_count,
-                        "status": "active",
-                    }
-                logger.error(f"Failed to get collection stats: {response.text}")
-                return {"collection_name": self.collection_name, "status": "error", "message": response.text}
+            response = await self.client.get(self._points_url)
+            if response.status_code == 200:
+                data = json_loads(response.content)
+                point_count = data.get("result", {}).get("points_count", 0)
+                return {
+                    "collection_name": self.collection_name,
+                    "point_count": point_count,
+                    "status": "active",
+                }
+            logger.error(f"Failed to get collection stats: {response.text}")
+            return {"collection_name": self.collection_name, "status": "error", "message": response.text}
         except Exception as e:
             logger.error(f"Error getting collection stats: {e}")
             return {"collection_name": self.collection_name, "status": "error", "message": str(e)}
 
-    def search_similar_resumes(self, query_text: str, job_role: Optional[str] = None, 
-                              limit: int = 10, score_threshold: float = 0.7, # score_threshold now applies to initial Qdrant retrieval
-                              initial_retrieval_limit: int = 40) -> List[Dict]: # MODIFIED: Default changed to 40
-        """
-        Synchronous wrapper for search_resumes method.
-        `limit` is the final number of results after re-ranking.
-        `initial_retrieval_limit` is the number of candidates for re-ranking.
-        """
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
-        results = loop.run_until_complete(
-            self.search_resumes(
-                query_text=query_text,
-                job_category=job_role,
-                limit=limit, # Final limit (determines re-ranking limit)
-                similarity_threshold=score_threshold, # Initial Qdrant threshold
-                initial_retrieval_limit=initial_retrieval_limit # Candidates for re-ranking
-            )
-        )
-        
-        return results
-
 # Global instance
 vector_service = VectorService()
@@ -6,21 +6,33 @@ Simple test for extraction functions
 import re
 from typing import Optional, Tuple
 
+# Patterns are compiled once here rather than looked up in re's cache on every call
+LOCATION_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:Address|Location|City)[:\s]+([A-Za-z\s,]+(?:,\s*[A-Za-z\s]+)*)',
+    r'([A-Za-z\s]+,\s*[A-Za-z\s]+,\s*\d{5,6})',  # City, State, PIN
+    r'([A-Za-z\s]+,\s*[A-Za-z\s]+)',  # City, State
+    r'(?:Based in|Located in|From)[:\s]+([A-Za-z\s,]+)',
+))
+CTC_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:Current\s*CTC|CTC|Salary)[:\s]*(?:Rs\.?\s*|INR\s*|₹\s*)?(\d+(?:\.\d+)?\s*(?:LPA|Lakhs?|L|K|Thousands?)?)',
+    r'(?:Current\s*Package|Package)[:\s]*(?:Rs\.?\s*|INR\s*|₹\s*)?(\d+(?:\.\d+)?\s*(?:LPA|Lakhs?|L|K|Thousands?)?)',
+    r'(?:Earning|Income)[:\s]*(?:Rs\.?\s*|INR\s*|₹\s*)?(\d+(?:\.\d+)?\s*(?:LPA|Lakhs?|L|K|Thousands?)?)',
+))
+NOTICE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:Notice\s*Period|Notice)[:\s]*(\d+\s*(?:days?|weeks?|months?))',
+    r'(?:Available\s*in|Can\s*join\s*in)[:\s]*(\d+\s*(?:days?|weeks?|months?))',
+    r'(?:Serving\s*notice|Notice\s*period)[:\s]*(\d+\s*(?:days?|weeks?|months?))',
+))
+IMMEDIATE_PATTERN = re.compile(r'(?:immediate|immediately\s*available)')
+
 def extract_location(text: str) -> Optional[str]:
     """Extract location/address from text"""
-    location_patterns = [
-        r'(?:Address|Location|City)[:\s]+([A-Za-z\s,]+(?:,\s*[A-Za-z\s]+)*)',
-        r'([A-Za-z\s]+,\s*[A-Za-z\s]+,\s*\d{5,6})',  # City, State, PIN
-        r'([A-Za-z\s]+,\s*[A-Za-z\s]+)',  # City, State
-        r'(?:Based in|Located in|From)[:\s]+([A-Za-z\s,]+)',
-    ]
-    
-    text_lines = text.split('\n')[:10]  # Check first 10 lines
+    text_lines = text.split('\n', 10)[:10]  # Check first 10 lines
     
     for line in text_lines:
         line = line.strip()
-        for pattern in location_patterns:
-            match = re.search(pattern, line, re.IGNORECASE)
+        for pattern in LOCATION_PATTERNS:
+            match = pattern.search(line)
             if match:
                 location = match.group(1).strip()
                 # Basic validation
@@ -31,41 +43,26 @@ def extract_location(text: str) -> Optional[str]:
 
 def extract_current_ctc(text: str) -> Optional[str]:
     """Extract current CTC from text"""
-    ctc_patterns = [
-        r'(?:Current\s*CTC|CTC|Salary)[:\s]*(?:Rs\.?\s*|INR\s*|₹\s*)?(\d+(?:\.\d+)?\s*(?:LPA|Lakhs?|L|K|Thousands?)?)',
-        r'(?:Current\s*Package|Package)[:\s]*(?:Rs\.?\s*|INR\s*|₹\s*)?(\d+(?:\.\d+)?\s*(?:LPA|Lakhs?|L|K|Thousands?)?)',
-        r'(?:Earning|Income)[:\s]*(?:Rs\.?\s*|INR\s*|₹\s*)?(\d+(?:\.\d+)?\s*(?:LPA|Lakhs?|L|K|Thousands?)?)',
-    ]
-    
     text_lower = text.lower()
     
-    for pattern in ctc_patterns:
-        matches = re.findall(pattern, text_lower, re.IGNORECASE)
-        if matches:
-            return matches[0].strip()
+    for pattern in CTC_PATTERNS:
+        match = pattern.search(text_lower)
+        if match:
+            return match.group(1).strip()
     
     return None
 
 def extract_notice_period(text: str) -> Optional[str]:
     """Extract notice period from text"""
-    notice_patterns = [
-        r'(?:Notice\s*Period|Notice)[:\s]*(\d+\s*(?:days?|weeks?|months?))',
-        r'(?:Available\s*in|Can\s*join\s*in)[:\s]*(\d+\s*(?:days?|weeks?|months?))',
-        r'(?:Serving\s*notice|Notice\s*period)[:\s]*(\d+\s*(?:days?|weeks?|months?))',
-    ]
-    
     text_lower = text.lower()
     
-    for pattern in notice_patterns:
-        matches = re.findall(pattern, text_lower, re.IGNORECASE)
-        if matches:
-            if isinstance(matches[0], str):
-                return matches[0].strip()
-            else:
-                return matches[0]
+    for pattern in NOTICE_PATTERNS:
+        match = pattern.search(text_lower)
+        if match:
+            return match.group(1).strip()
     
     # Check for immediate availability
-    if re.search(r'(?:immediate|immediately\s*available)', text_lower):
+    if IMMEDIATE_PATTERN.search(text_lower):
         return "Immediate"
     
     return None
@@ -165,6 +162,7 @@ def test_extraction():
         print("\n🎉 All tests passed!")
     else:
         print("\n⚠️  Some tests failed. Check extraction logic.")
+    assert all_passed, "Extraction results differ from the expected values"
 
 if __name__ == "__main__":
     test_extraction()
\ No newline at end of file
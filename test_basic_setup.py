@@ -2,32 +2,91 @@
 """
 Basic setup test for the Resume Matching System
 """
+import atexit
+import importlib.util
 import sys
 import os
+import re
 import subprocess
 
+from _test_utils import log, run_concurrently
+
+try:
+    import docker
+except ImportError:
+    docker = None
+
+_docker_client = None
+_pg_pool = None
+_redis_pool = None
+
+
+def get_docker_client():
+    """Shared Docker Engine client talking to the daemon socket directly"""
+    global _docker_client
+    if _docker_client is None:
+        _docker_client = docker.from_env()
+    return _docker_client
+
+
+def get_pg_pool():
+    """Process-wide PostgreSQL pool, so repeated probes skip the connect handshake"""
+    global _pg_pool
+    if _pg_pool is None:
+        from psycopg2.pool import ThreadedConnectionPool
+        _pg_pool = ThreadedConnectionPool(
+            1, 4,
+            host="localhost",
+            port=5432,
+            database="resume_db",
+            user="postgres",
+            password="password"
+        )
+        atexit.register(_pg_pool.closeall)
+    return _pg_pool
+
+
+def get_redis_pool():
+    """Process-wide Redis connection pool"""
+    global _redis_pool
+    if _redis_pool is None:
+        import redis
+        _redis_pool = redis.ConnectionPool(host='localhost', port=6379, db=0)
+        atexit.register(_redis_pool.disconnect)
+    return _redis_pool
+
+
+def compose_project_name():
+    """Project label Compose gives this directory's containers"""
+    name = os.getenv("COMPOSE_PROJECT_NAME") or os.path.basename(os.getcwd())
+    return re.sub(r'[^a-z0-9_-]', '', name.lower())
+
+
 def test_docker_services():
     """Test if Docker services are running"""
-    print("🔍 Testing Docker services...")
+    log("🔍 Testing Docker services...")
     
-    try:
-        result = subprocess.run(['docker-compose', 'ps'], 
-                              capture_output=True, text=True, cwd='.')
-        if result.returncode == 0:
-            print("✅ Docker Compose is working")
-            print(result.stdout)
-            return True
-        else:
-            print("❌ Docker Compose failed")
-            print(result.stderr)
-            return False
-    except Exception as e:
-        print(f"❌ Error running docker-compose: {e}")
-        return False
+    if docker is not None:
+        client = get_docker_client()
+        client.ping()
+        containers = client.containers.list(
+            all=True, filters={"label": f"com.docker.compose.project={compose_project_name()}"}
+        )
+        log("✅ Docker daemon is reachable")
+        for container in containers:
+            marker = "✅" if container.status == "running" else "⚠️ "
+            log(f"   {marker} {container.name}: {container.status}")
+        return
+    
+    result = subprocess.run(['docker-compose', 'ps'], 
+                          capture_output=True, text=True, cwd='.')
+    assert result.returncode == 0, f"Docker Compose failed: {result.stderr}"
+    log("✅ Docker Compose is working")
+    log(result.stdout)
 
 def test_python_imports():
     """Test basic Python imports"""
-    print("\n🔍 Testing Python imports...")
+    log("\n🔍 Testing Python imports...")
     
     required_modules = [
         'fastapi',
@@ -41,53 +100,38 @@ def test_python_imports():
     
     failed_imports = []
     
+    # Only installation matters here, so locate each module without executing it
     for module in required_modules:
-        try:
-            __import__(module)
-            print(f"✅ {module}")
-        except ImportError as e:
-            print(f"❌ {module}: {e}")
+        if importlib.util.find_spec(module) is not None:
+            log(f"✅ {module}")
+        else:
+            log(f"❌ {module}: No module named '{module}'")
             failed_imports.append(module)
     
-    return len(failed_imports) == 0
+    assert not failed_imports, f"Missing modules: {', '.join(failed_imports)}"
 
 def test_database_connection():
     """Test database connection"""
-    print("\n🔍 Testing database connection...")
+    log("\n🔍 Testing database connection...")
     
+    pool = get_pg_pool()
+    conn = pool.getconn()
     try:
-        import psycopg2
-        conn = psycopg2.connect(
-            host="localhost",
-            port=5432,
-            database="resume_db",
-            user="postgres",
-            password="password"
-        )
-        cursor = conn.cursor()
-        cursor.execute("SELECT version();")
-        version = cursor.fetchone()
-        print(f"✅ PostgreSQL connected: {version[0]}")
-        cursor.close()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"❌ Database connection failed: {e}")
-        return False
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT version();")
+            version = cursor.fetchone()
+    finally:
+        pool.putconn(conn)
+    log(f"✅ PostgreSQL connected: {version[0]}")
 
 def test_redis_connection():
     """Test Redis connection"""
-    print("\n🔍 Testing Redis connection...")
+    log("\n🔍 Testing Redis connection...")
     
-    try:
-        import redis
-        r = redis.Redis(host='localhost', port=6379, db=0)
-        r.ping()
-        print("✅ Redis connected")
-        return True
-    except Exception as e:
-        print(f"❌ Redis connection failed: {e}")
-        return False
+    import redis
+    r = redis.Redis(connection_pool=get_redis_pool())
+    assert r.ping(), "Redis did not answer PING"
+    log("✅ Redis connected")
 
 def main():
     """Run all tests"""
@@ -100,15 +144,12 @@ def main():
         ("Redis Connection", test_redis_connection),
     ]
     
+    # The probes are independent I/O checks, so run them together and
+    # replay each one's output in order once they finish
     results = []
-    
-    for test_name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"❌ {test_name} failed with exception: {e}")
-            results.append((test_name, False))
+    for test_name, result, lines in run_concurrently(tests, max_workers=len(tests)):
+        print('\n'.join(lines), flush=True)
+        results.append((test_name, result))
     
     print("\n" + "="*50)
     print("📊 TEST RESULTS SUMMARY")
@@ -1,9 +1,12 @@
 """
 Test script for the resume download endpoint
 """
-import requests
-import json
-import os
+import pytest
+
+from _test_utils import JSON_HEADERS, json_dumps, stream_to_file
+
+# Needs the API server; skipped under pytest when it is not running
+pytestmark = pytest.mark.usefixtures("api_server")
 
 # Sample resume data (similar to what would be sent from the frontend)
 sample_resume = {
@@ -40,30 +43,23 @@ sample_resume = {
     "similarity_score": 0.95
 }
 
+# Request body, encoded once at import
+PAYLOAD = json_dumps({
+    "resume_data": sample_resume,
+    "template": "professional"  # Try different templates: professional, modern, compact
+})
+
 def test_download_endpoint():
     """Test the resume download endpoint"""
-    # URL of your API
-    url = "http://localhost:8000/resumes/download/docx"
-    
-    # Data to send
-    data = {
-        "resume_data": sample_resume,
-        "template": "professional"  # Try different templates: professional, modern, compact
-    }
-    
-    # Make the request
-    response = requests.post(url, json=data)
+    # Make the request, streaming the document straight to disk
+    filename = f"{sample_resume['name'].replace(' ', '_')}_test_resume.docx"
+    response = stream_to_file(
+        filename, "POST", "/resumes/download/docx", content=PAYLOAD, headers=JSON_HEADERS
+    )
     
     # Check if the request was successful
-    if response.status_code == 200:
-        # Save the file
-        filename = f"{sample_resume['name'].replace(' ', '_')}_test_resume.docx"
-        with open(filename, "wb") as f:
-            f.write(response.content)
-        print(f"Successfully downloaded resume to {filename}")
-    else:
-        print(f"Error: {response.status_code}")
-        print(response.text)
+    assert response.status_code == 200, f"Error: {response.status_code} {response.text}"
+    print(f"Successfully downloaded resume to {filename}")
 
 if __name__ == "__main__":
     test_download_endpoint()
\ No newline at end of file
@@ -2,12 +2,55 @@
 """
 Test script for resume download functionality - Light Version
 """
-import requests
-import json
-import time
+import argparse
+import asyncio
+import httpx
+import random
 import os
 
-BASE_URL = "http://localhost:8000"
+import pytest
+
+from _test_utils import (
+    SESSION, astream_to_file, async_client, get_templates, is_interactive, response_json, stream_to_file
+)
+
+# Every test here talks to the API server; skipped under pytest when it is not running
+pytestmark = pytest.mark.usefixtures("api_server")
+
+TEMPLATES = ['professional', 'modern', 'compact']
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+# Renders in flight at once, and tries per render when the connection drops
+DOWNLOAD_CONCURRENCY = 3
+DOWNLOAD_ATTEMPTS = 3
+
+
+async def _download_template(client, semaphore, resume_ids, template):
+    """Render one template and save it to test_download_<template>.docx"""
+    download_data = {
+        'resume_ids': ','.join(resume_ids),
+        'template': template,
+        'filename_prefix': f'Test_{template}'
+    }
+    async with semaphore:
+        for attempt in range(DOWNLOAD_ATTEMPTS):
+            try:
+                return await astream_to_file(
+                    client, f"test_download_{template}.docx", "POST", "/download_selected_resumes", data=download_data
+                )
+            except httpx.TransportError:
+                if attempt == DOWNLOAD_ATTEMPTS - 1:
+                    raise
+                # Full jitter keeps retried renders from reaching the server in lockstep
+                await asyncio.sleep(random.uniform(0, 0.5 * 2 ** attempt))
+
+
+async def _download_templates(resume_ids):
+    """Render every template at once; the server-side DOCX builds overlap"""
+    semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+    async with async_client() as client:
+        return await asyncio.gather(
+            *(_download_template(client, semaphore, resume_ids, template) for template in TEMPLATES)
+        )
 
 def test_search_and_download():
     """Test the complete search and download workflow"""
@@ -22,85 +65,57 @@ def test_search_and_download():
         'similarity_threshold': 0.3
     }
     
-    try:
-        response = requests.post(f"{BASE_URL}/search_profile", data=search_data)
-        if response.status_code == 200:
-            search_results = response.json()
-            print(f"✅ Search successful: Found {search_results.get('total_results', 0)} results")
-            
-            if search_results.get('results'):
-                # Extract resume IDs
-                resume_ids = [result['id'] for result in search_results['results'][:3]]  # Take first 3
-                print(f"📋 Selected resume IDs: {resume_ids}")
-                
-                # Step 2: Test template listing
-                print("\n2. Getting available templates...")
-                template_response = requests.get(f"{BASE_URL}/templates")
-                if template_response.status_code == 200:
-                    templates = template_response.json()
-                    print(f"✅ Available templates: {templates.get('templates', [])}")
-                else:
-                    print(f"❌ Template fetch failed: {template_response.status_code}")
-                
-                # Step 3: Test download selected resumes
-                print("\n3. Testing download selected resumes...")
-                for template in ['professional', 'modern', 'compact']:
-                    print(f"\n   Testing {template} template...")
-                    download_data = {
-                        'resume_ids': ','.join(resume_ids),
-                        'template': template,
-                        'filename_prefix': f'Test_{template}'
-                    }
-                    
-                    download_response = requests.post(f"{BASE_URL}/download_selected_resumes", data=download_data)
-                    if download_response.status_code == 200:
-                        # Save the file
-                        filename = f"test_download_{template}.docx"
-                        with open(filename, 'wb') as f:
-                            f.write(download_response.content)
-                        
-                        file_size = len(download_response.content)
-                        print(f"   ✅ {template} template: Downloaded {filename} ({file_size} bytes)")
-                        
-                        # Verify it's a valid Word document
-                        if download_response.headers.get('content-type') == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
-                            print(f"   ✅ Valid Word document format")
-                        else:
-                            print(f"   ⚠️  Unexpected content type: {download_response.headers.get('content-type')}")
-                    else:
-                        print(f"   ❌ {template} template failed: {download_response.status_code}")
-                        print(f"   Error: {download_response.text}")
-                
-                # Step 4: Test download search results directly
-                print("\n4. Testing download search results directly...")
-                search_download_data = {
-                    'query': 'Python developer',
-                    'limit': 3,
-                    'similarity_threshold': 0.3,
-                    'template': 'professional',
-                    'filename_prefix': 'Direct_Search_Results'
-                }
-                
-                search_download_response = requests.post(f"{BASE_URL}/download_search_results", data=search_download_data)
-                if search_download_response.status_code == 200:
-                    filename = "test_search_download.docx"
-                    with open(filename, 'wb') as f:
-                        f.write(search_download_response.content)
-                    
-                    file_size = len(search_download_response.content)
-                    print(f"✅ Direct search download: {filename} ({file_size} bytes)")
-                else:
-                    print(f"❌ Direct search download failed: {search_download_response.status_code}")
-                    print(f"Error: {search_download_response.text}")
-                
-            else:
-                print("❌ No search results found to test download")
-        else:
-            print(f"❌ Search failed: {response.status_code}")
-            print(f"Error: {response.text}")
+    response = SESSION.post("/search_profile", data=search_data)
+    assert response.status_code == 200, f"Search failed: {response.status_code} {response.text}"
+    search_results = response_json(response)
+    print(f"✅ Search successful: Found {search_results.get('total_results', 0)} results")
+    assert search_results.get('results'), "No search results found to test download"
     
-    except Exception as e:
-        print(f"❌ Test failed with error: {e}")
+    # Extract resume IDs
+    resume_ids = [result['id'] for result in search_results['results'][:3]]  # Take first 3
+    print(f"📋 Selected resume IDs: {resume_ids}")
+    
+    # Step 2: Test template listing
+    print("\n2. Getting available templates...")
+    template_response = get_templates()
+    assert template_response.status_code == 200, f"Template fetch failed: {template_response.status_code}"
+    templates = response_json(template_response)
+    print(f"✅ Available templates: {templates.get('templates', [])}")
+    
+    # Step 3: Test download selected resumes
+    print("\n3. Testing download selected resumes...")
+    download_responses = asyncio.run(_download_templates(resume_ids))
+    for template, download_response in zip(TEMPLATES, download_responses):
+        print(f"\n   Testing {template} template...")
+        assert download_response.status_code == 200, \
+            f"{template} template failed: {download_response.status_code} {download_response.text}"
+        filename = f"test_download_{template}.docx"
+        file_size = os.path.getsize(filename)
+        print(f"   ✅ {template} template: Downloaded {filename} ({file_size} bytes)")
+        
+        # Verify it's a valid Word document
+        content_type = download_response.headers.get('content-type')
+        assert content_type == DOCX_CONTENT_TYPE, f"Unexpected content type: {content_type}"
+        print(f"   ✅ Valid Word document format")
+    
+    # Step 4: Test download search results directly
+    print("\n4. Testing download search results directly...")
+    search_download_data = {
+        'query': 'Python developer',
+        'limit': 3,
+        'similarity_threshold': 0.3,
+        'template': 'professional',
+        'filename_prefix': 'Direct_Search_Results'
+    }
+    
+    filename = "test_search_download.docx"
+    search_download_response = stream_to_file(
+        filename, "POST", "/download_search_results", data=search_download_data
+    )
+    assert search_download_response.status_code == 200, \
+        f"Direct search download failed: {search_download_response.status_code} {search_download_response.text}"
+    file_size = os.path.getsize(filename)
+    print(f"✅ Direct search download: {filename} ({file_size} bytes)")
 
 def test_error_cases():
     """Test error handling"""
@@ -115,11 +130,9 @@ def test_error_cases():
         'filename_prefix': 'Invalid_Test'
     }
     
-    response = requests.post(f"{BASE_URL}/download_selected_resumes", data=invalid_data)
-    if response.status_code == 404:
-        print("✅ Correctly handled invalid resume IDs (404 error)")
-    else:
-        print(f"⚠️  Unexpected response for invalid IDs: {response.status_code}")
+    response = SESSION.post("/download_selected_resumes", data=invalid_data)
+    assert response.status_code == 404, f"Unexpected response for invalid IDs: {response.status_code}"
+    print("✅ Correctly handled invalid resume IDs (404 error)")
     
     # Test with empty resume IDs
     print("\n2. Testing with empty resume IDs...")
@@ -129,11 +142,9 @@ def test_error_cases():
         'filename_prefix': 'Empty_Test'
     }
     
-    response = requests.post(f"{BASE_URL}/download_selected_resumes", data=empty_data)
-    if response.status_code == 400:
-        print("✅ Correctly handled empty resume IDs (400 error)")
-    else:
-        print(f"⚠️  Unexpected response for empty IDs: {response.status_code}")
+    response = SESSION.post("/download_selected_resumes", data=empty_data)
+    assert response.status_code == 400, f"Unexpected response for empty IDs: {response.status_code}"
+    print("✅ Correctly handled empty resume IDs (400 error)")
 
 def cleanup_test_files():
     """Clean up test files"""
@@ -146,16 +157,27 @@ def cleanup_test_files():
     ]
     
     for filename in test_files:
-        if os.path.exists(filename):
+        try:
             os.remove(filename)
-            print(f"Removed {filename}")
+        except FileNotFoundError:
+            continue
+        print(f"Removed {filename}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resume download tests (light version)")
+    parser.add_argument("--yes", action="store_true", help="start without waiting for Enter")
+    parser.add_argument(
+        "--cleanup", action=argparse.BooleanOptionalAction, default=None,
+        help="delete (or with --no-cleanup keep) the generated .docx files without asking"
+    )
+    args = parser.parse_args()
+    
     print("🚀 Starting Resume Download Tests (Light Version)")
     print("Make sure your light server is running on http://localhost:8000")
     print("And that you have some resumes uploaded and indexed")
     
-    input("\nPress Enter to continue...")
+    if not args.yes and is_interactive():
+        input("\nPress Enter to continue...")
     
     try:
         # Test main functionality
@@ -171,9 +193,15 @@ if __name__ == "__main__":
         print("- test_download_compact.docx")
         print("- test_search_download.docx")
         
-        # Ask if user wants to clean up
-        cleanup = input("\nDo you want to clean up test files? (y/n): ")
-        if cleanup.lower() == 'y':
+        # Ask if user wants to clean up, unless --cleanup/--no-cleanup decided it;
+        # unattended runs clean up
+        if args.cleanup is not None:
+            do_cleanup = args.cleanup
+        elif not is_interactive():
+            do_cleanup = True
+        else:
+            do_cleanup = input("\nDo you want to clean up test files? (y/n): ").lower() == 'y'
+        if do_cleanup:
             cleanup_test_files()
         
     except KeyboardInterrupt:
@@ -2,66 +2,73 @@
 """
 Quick test to verify light setup is working
 """
-import requests
+import asyncio
+import httpx
 import sys
 
-BASE_URL = "http://localhost:8000"
+import pytest
+
+from _test_utils import async_client, response_json
+
+# Needs the API server; skipped under pytest when it is not running
+pytestmark = pytest.mark.usefixtures("api_server")
+
+PROBE_PATHS = ("/health", "/templates", "/")
+
+
+async def _fetch_probes():
+    """GET every probe path at once over one client"""
+    async with async_client() as client:
+        return await asyncio.gather(*(client.get(path) for path in PROBE_PATHS))
+
+
+def _check(response, passed, failed):
+    """Report one probe and return its decoded body; fails unless it answered 200"""
+    assert response.status_code == 200, f"{failed}: {response.status_code}"
+    print(f"✅ {passed}")
+    return response_json(response)
 
 def test_light_setup():
     """Test basic light setup functionality"""
     print("🧪 Testing Light Setup")
     print("=" * 30)
     
-    try:
-        # Test health endpoint
-        print("\n1. Testing health endpoint...")
-        response = requests.get(f"{BASE_URL}/health")
-        if response.status_code == 200:
-            health_data = response.json()
-            print("✅ Health check passed")
-            print(f"   MinIO: {health_data.get('minio_status', 'Unknown')}")
-            print(f"   Vector: {health_data.get('vector_status', 'Unknown')}")
-        else:
-            print(f"❌ Health check failed: {response.status_code}")
-            return False
-        
-        # Test templates endpoint
-        print("\n2. Testing templates endpoint...")
-        response = requests.get(f"{BASE_URL}/templates")
-        if response.status_code == 200:
-            templates_data = response.json()
-            print("✅ Templates endpoint working")
-            print(f"   Available templates: {templates_data.get('templates', [])}")
-        else:
-            print(f"❌ Templates endpoint failed: {response.status_code}")
-            return False
-        
-        # Test root endpoint
-        print("\n3. Testing root endpoint...")
-        response = requests.get(f"{BASE_URL}/")
-        if response.status_code == 200:
-            root_data = response.json()
-            print("✅ Root endpoint working")
-            print(f"   Service: {root_data.get('message', 'Unknown')}")
-        else:
-            print(f"❌ Root endpoint failed: {response.status_code}")
-            return False
-        
-        print("\n✅ Light setup is working correctly!")
-        return True
-        
-    except requests.exceptions.ConnectionError:
-        print("❌ Cannot connect to server. Make sure it's running on http://localhost:8000")
-        return False
-    except Exception as e:
-        print(f"❌ Test failed with error: {e}")
-        return False
+    # The probes are independent, so fetch them together and report in order
+    health_response, templates_response, root_response = asyncio.run(_fetch_probes())
+
+    # Test health endpoint
+    print("\n1. Testing health endpoint...")
+    health_data = _check(health_response, "Health check passed", "Health check failed")
+    print(f"   MinIO: {health_data.get('minio_status', 'Unknown')}")
+    print(f"   Vector: {health_data.get('vector_status', 'Unknown')}")
+    
+    # Test templates endpoint
+    print("\n2. Testing templates endpoint...")
+    templates_data = _check(templates_response, "Templates endpoint working", "Templates endpoint failed")
+    print(f"   Available templates: {templates_data.get('templates', [])}")
+    
+    # Test root endpoint
+    print("\n3. Testing root endpoint...")
+    root_data = _check(root_response, "Root endpoint working", "Root endpoint failed")
+    print(f"   Service: {root_data.get('message', 'Unknown')}")
+    
+    print("\n✅ Light setup is working correctly!")
 
 if __name__ == "__main__":
     print("🚀 Light Setup Test")
     print("Make sure your light server is running: docker-compose -f docker-compose.light.yml up")
     
-    if test_light_setup():
+    try:
+        test_light_setup()
+        passed = True
+    except httpx.ConnectError:
+        print("❌ Cannot connect to server. Make sure it's running on http://localhost:8000")
+        passed = False
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        passed = False
+    
+    if passed:
         print("\n🎉 Ready to test download functionality!")
         print("Run: python test_single_download_light.py")
     else:
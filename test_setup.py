@@ -3,64 +3,137 @@
 Test script to verify the AI-Powered Resume Matching System setup
 """
 
+import argparse
+import glob
+import hashlib
+import importlib
+import importlib.metadata
+import importlib.util
+import shelve
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+# When run as a script this directory is already sys.path[0]; otherwise put it
+# first so the app package is found on the first probe
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
 
-def test_imports():
-    """Test if all required modules can be imported"""
-    print("Testing imports...")
-    
-    try:
-        from app.config import settings
-        print("✓ Config loaded successfully")
-        print(f"  - Job roles: {settings.job_roles_list}")
-        print(f"  - Allowed extensions: {settings.allowed_extensions_list}")
-    except Exception as e:
-        print(f"✗ Config import failed: {e}")
-        return False
-    
-    try:
-        from app.models.database import Base, engine
-        print("✓ Database models imported successfully")
-    except Exception as e:
-        print(f"✗ Database models import failed: {e}")
-        return False
-    
-    try:
-        from app.services.file_service import file_service
-        print("✓ File service imported successfully")
-    except Exception as e:
-        print(f"✗ File service import failed: {e}")
-        return False
-    
-    try:
-        from app.services.document_parser import document_parser
-        print("✓ Document parser imported successfully")
-    except Exception as e:
-        print(f"✗ Document parser import failed: {e}")
-        return False
-    
+def _describe_settings(settings):
+    return [
+        f"  - Job roles: {settings.job_roles_list}",
+        f"  - Allowed extensions: {settings.allowed_extensions_list}",
+    ]
+
+# (module, names it must export, success message, failure label, optional detail lines)
+IMPORT_CHECKS = [
+    ("app.config", ("settings",), "Config loaded successfully", "Config import", _describe_settings),
+    ("app.models.database", ("Base", "engine"), "Database models imported successfully", "Database models import", None),
+    ("app.services.file_service", ("file_service",), "File service imported successfully", "File service import", None),
+    ("app.services.document_parser", ("document_parser",), "Document parser imported successfully", "Document parser import", None),
+    ("app.services.vector_service", ("vector_service",), "Vector service imported successfully", "Vector service import", None),
+    ("app.main", ("app",), "FastAPI app imported successfully", "FastAPI app import", None),
+]
+
+def _run_import_check(check):
+    """Import one module and return (detail lines, error)"""
+    module_name, names, _, _, describe = check
     try:
-        from app.services.vector_service import vector_service
-        print("✓ Vector service imported successfully")
+        module = importlib.import_module(module_name)
+        values = [getattr(module, name) for name in names]
+        return (describe(*values) if describe else []), None
     except Exception as e:
-        print(f"✗ Vector service import failed: {e}")
-        return False
-    
+        return [], e
+
+def _find_import_check(check):
+    """Locate one module without executing it and return (detail lines, error)"""
+    module_name = check[0]
     try:
-        from app.main import app
-        print("✓ FastAPI app imported successfully")
+        spec = importlib.util.find_spec(module_name)
     except Exception as e:
-        print(f"✗ FastAPI app import failed: {e}")
-        return False
-    
-    return True
+        return [], e
+    if spec is None or spec.loader is None:
+        return [], ModuleNotFoundError(f"No module named '{module_name}'")
+    return [], None
 
-def test_directory_structure():
-    """Test if all required directories exist"""
-    print("\nTesting directory structure...")
+# Remembers the app fingerprint of the last deep import check that passed
+IMPORT_CACHE_PATH = os.path.join(HERE, ".test_setup_cache")
+
+def _app_fingerprint():
+    """Digest of sys.path, the installed package versions and every app module's mtime"""
+    digest = hashlib.sha256("\0".join(sys.path).encode())
+    # An upgraded, broken or uninstalled dependency must invalidate a cached pass too
+    packages = sorted(f"{dist.metadata['Name']}=={dist.version}" for dist in importlib.metadata.distributions())
+    digest.update("\0".join(packages).encode())
+    for path in sorted(glob.glob(os.path.join(HERE, "app", "**", "*.py"), recursive=True)):
+        digest.update(f"{path}\0{os.stat(path).st_mtime_ns}\0".encode())
+    return digest.hexdigest()
+
+def _report(heading, checks):
+    """Drain a check generator, print its lines in one write and return whether all passed"""
+    results = list(checks)
+    sys.stdout.write("".join(f"{line}\n" for line in [heading, *(msg for _, msg in results)]))
+    return all(ok for ok, _ in results)
+
+def check_imports(sequential=False, deep=False, force=False):
+    """Yield (ok, message) for each required module import"""
+    # By default only resolve each module; --deep executes them, which builds
+    # the database engine and loads the vector models
+    run_check = _run_import_check if deep else _find_import_check
+    
+    # A deep check that passed stays valid until the app sources or sys.path change
+    fingerprint = _app_fingerprint() if deep else None
+    if deep and not force:
+        with shelve.open(IMPORT_CACHE_PATH) as cache:
+            if cache.get("deep_imports_ok") == fingerprint:
+                yield True, "✓ App modules unchanged since the last passing deep import check (--force to rerun)"
+                return
+    
+    # Imports are dominated by file reads, so load the modules on threads and
+    # report once every one has finished; --sequential keeps tracebacks in order
+    if sequential:
+        outcomes = [run_check(check) for check in IMPORT_CHECKS]
+    else:
+        with ThreadPoolExecutor(max_workers=len(IMPORT_CHECKS)) as executor:
+            outcomes = list(executor.map(run_check, IMPORT_CHECKS))
+    
+    all_imported = True
+    for (module_name, _, passed, failed, _), (details, error) in zip(IMPORT_CHECKS, outcomes):
+        if error is None:
+            yield True, (f"✓ {passed}" if deep else f"✓ {module_name} found")
+            for line in details:
+                yield True, line
+        else:
+            yield False, f"✗ {failed} failed: {error}"
+            all_imported = False
     
+    if deep and all_imported:
+        with shelve.open(IMPORT_CACHE_PATH) as cache:
+            cache["deep_imports_ok"] = fingerprint
+
+def test_imports(sequential=False, deep=False, force=False):
+    """Test if all required modules can be imported"""
+    assert _report("Testing imports...", check_imports(sequential, deep, force)), "Some modules failed to import"
+
+def _existing_paths(paths):
+    """Return the subset of paths that exist, listing each parent directory once"""
+    by_parent = defaultdict(list)
+    for path in paths:
+        by_parent[os.path.dirname(path) or "."].append(path)
+    
+    present = set()
+    for parent, children in by_parent.items():
+        try:
+            with os.scandir(parent) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            continue  # missing parent: none of its children exist
+        present.update(path for path in children if os.path.basename(path) in names)
+    return present
+
+def check_directory_structure():
+    """Yield (ok, message) for each required directory, stopping at the first missing one"""
     required_dirs = [
         "app",
         "app/models",
@@ -70,19 +143,20 @@ def test_directory_structure():
         "app/tasks"
     ]
     
+    present = _existing_paths(required_dirs)
     for dir_path in required_dirs:
-        if os.path.exists(dir_path):
-            print(f"✓ {dir_path} exists")
+        if dir_path in present:
+            yield True, f"✓ {dir_path} exists"
         else:
-            print(f"✗ {dir_path} missing")
-            return False
-    
-    return True
+            yield False, f"✗ {dir_path} missing"
+            return
 
-def test_required_files():
-    """Test if all required files exist"""
-    print("\nTesting required files...")
-    
+def test_directory_structure():
+    """Test if all required directories exist"""
+    assert _report("\nTesting directory structure...", check_directory_structure()), "A required directory is missing"
+
+def check_required_files():
+    """Yield (ok, message) for each required file, stopping at the first missing one"""
     required_files = [
         "requirements.txt",
         "docker-compose.yml", 
@@ -103,16 +177,27 @@ def test_required_files():
         "app/tasks/resume_processing.py"
     ]
     
+    present = _existing_paths(required_files)
     for file_path in required_files:
-        if os.path.exists(file_path):
-            print(f"✓ {file_path} exists")
+        if file_path in present:
+            yield True, f"✓ {file_path} exists"
         else:
-            print(f"✗ {file_path} missing")
-            return False
-    
+            yield False, f"✗ {file_path} missing"
+            return
+
+def test_required_files():
+    """Test if all required files exist"""
+    assert _report("\nTesting required files...", check_required_files()), "A required file is missing"
+
+def _passed(test, *args):
+    """Run one test function, returning False instead of raising when it fails"""
+    try:
+        test(*args)
+    except AssertionError:
+        return False
     return True
 
-def main():
+def main(sequential=False, deep=False, force=False):
     """Main test function"""
     print("=" * 60)
     print("AI-Powered Resume Matching System - Setup Test")
@@ -121,15 +206,15 @@ def main():
     all_tests_passed = True
     
     # Test directory structure
-    if not test_directory_structure():
+    if not _passed(test_directory_structure):
         all_tests_passed = False
     
     # Test required files
-    if not test_required_files():
+    if not _passed(test_required_files):
         all_tests_passed = False
     
     # Test imports
-    if not test_imports():
+    if not _passed(test_imports, sequential, deep, force):
         all_tests_passed = False
     
     print("\n" + "=" * 60)
@@ -144,4 +229,9 @@ def main():
     print("=" * 60)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Check the resume matching system setup")
+    parser.add_argument("--sequential", action="store_true", help="import the app modules one at a time")
+    parser.add_argument("--deep", action="store_true", help="execute the app modules instead of only locating them")
+    parser.add_argument("--force", action="store_true", help="rerun --deep imports even if a cached pass still matches")
+    args = parser.parse_args()
+    main(args.sequential, args.deep, args.force)
\ No newline at end of file
@@ -2,12 +2,56 @@
 """
 Test script for single resume download functionality - Light Version
 """
-import requests
-import json
-import time
+import argparse
+import asyncio
+import functools
 import os
+import re
+
+import pytest
+
+from _test_utils import SESSION, astream_to_file, async_client, get_templates, is_interactive, response_json
+
+# Every test here talks to the API server; skipped under pytest when it is not running
+pytestmark = pytest.mark.usefixtures("api_server")
+
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+# Documents written by this script, and every generated test document
+DOWNLOADED_FILE_PATTERN = re.compile(r'test_(?:single|multi)_download_.*\.docx$')
+TEST_DOCUMENT_PATTERN = re.compile(r'test_.*\.docx$')
+# One search supplies the resume IDs for every test in this script
+SEARCH_DATA = {
+    'query': 'Python developer software engineer',
+    'limit': 5,
+    'similarity_threshold': 0.3
+}
+
+
+@functools.lru_cache(maxsize=8)
+def search_profile(query, limit, similarity_threshold):
+    """POST /search_profile once per distinct form; repeat calls reuse the response"""
+    return SESSION.post("/search_profile", data={
+        'query': query,
+        'limit': limit,
+        'similarity_threshold': similarity_threshold
+    })
+
+
+async def _download_all_async(downloads):
+    async with async_client() as client:
+        return await asyncio.gather(*(
+            astream_to_file(client, filename, "POST", "/download_single_resume", data=data)
+            for filename, data in downloads
+        ))
+
+
+def _download_all(downloads):
+    """POST every (filename, payload) to /download_single_resume concurrently
+
+    Successful bodies stream straight into their files; responses come back in order.
+    """
+    return asyncio.run(_download_all_async(downloads))
 
-BASE_URL = "http://localhost:8000"
 
 def test_single_resume_download():
     """Test the single resume download functionality"""
@@ -16,109 +60,86 @@ def test_single_resume_download():
     
     # Step 1: Perform a search to get resume IDs
     print("\n1. Performing search to get resume data...")
-    search_data = {
-        'query': 'Python developer software engineer',
-        'limit': 5,
-        'similarity_threshold': 0.3
-    }
+    response = search_profile(**SEARCH_DATA)
+    assert response.status_code == 200, f"Search failed: {response.status_code} {response.text}"
+    search_results = response_json(response)
+    print(f"✅ Search successful: Found {search_results.get('total_results', 0)} results")
+    assert search_results.get('results'), "No search results found to test download"
     
-    try:
-        response = requests.post(f"{BASE_URL}/search_profile", data=search_data)
-        if response.status_code == 200:
-            search_results = response.json()
-            print(f"✅ Search successful: Found {search_results.get('total_results', 0)} results")
-            
-            if search_results.get('results'):
-                # Get first resume for testing
-                first_resume = search_results['results'][0]
-                resume_id = first_resume['id']
-                resume_name = first_resume.get('name', 'Unknown')
-                
-                print(f"📋 Selected resume: {resume_name} (ID: {resume_id})")
-                
-                # Step 2: Test template listing
-                print("\n2. Getting available templates...")
-                template_response = requests.get(f"{BASE_URL}/templates")
-                if template_response.status_code == 200:
-                    templates = template_response.json()
-                    print(f"✅ Available templates: {templates.get('templates', [])}")
-                    available_templates = templates.get('templates', ['professional'])
-                else:
-                    print(f"❌ Template fetch failed: {template_response.status_code}")
-                    available_templates = ['professional']
-                
-                # Step 3: Test single resume download for each template
-                print(f"\n3. Testing single resume download for: {resume_name}")
-                
-                for template in available_templates:
-                    print(f"\n   Testing {template} template...")
-                    download_data = {
-                        'resume_id': resume_id,
-                        'template': template,
-                        'filename_prefix': f'SingleTest_{template}'
-                    }
-                    
-                    download_response = requests.post(f"{BASE_URL}/download_single_resume", data=download_data)
-                    if download_response.status_code == 200:
-                        # Save the file
-                        filename = f"test_single_download_{template}_{resume_name.replace(' ', '_')}.docx"
-                        with open(filename, 'wb') as f:
-                            f.write(download_response.content)
-                        
-                        file_size = len(download_response.content)
-                        print(f"   ✅ {template} template: Downloaded {filename} ({file_size} bytes)")
-                        
-                        # Verify it's a valid Word document
-                        content_type = download_response.headers.get('content-type')
-                        if content_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
-                            print(f"   ✅ Valid Word document format")
-                        else:
-                            print(f"   ⚠️  Unexpected content type: {content_type}")
-                        
-                        # Check filename in headers
-                        content_disposition = download_response.headers.get('content-disposition', '')
-                        if 'attachment' in content_disposition:
-                            print(f"   ✅ Proper download headers set")
-                        else:
-                            print(f"   ⚠️  Missing download headers")
-                            
-                    else:
-                        print(f"   ❌ {template} template failed: {download_response.status_code}")
-                        print(f"   Error: {download_response.text}")
-                
-                # Step 4: Test with multiple resumes for comparison
-                if len(search_results['results']) > 1:
-                    print(f"\n4. Testing downloads for multiple resumes...")
-                    for i, resume in enumerate(search_results['results'][:3], 1):
-                        resume_id = resume['id']
-                        resume_name = resume.get('name', f'Resume_{i}')
-                        
-                        print(f"\n   Downloading resume {i}: {resume_name}")
-                        download_data = {
-                            'resume_id': resume_id,
-                            'template': 'professional',
-                            'filename_prefix': f'MultiTest_{i}'
-                        }
-                        
-                        download_response = requests.post(f"{BASE_URL}/download_single_resume", data=download_data)
-                        if download_response.status_code == 200:
-                            filename = f"test_multi_download_{i}_{resume_name.replace(' ', '_')}.docx"
-                            with open(filename, 'wb') as f:
-                                f.write(download_response.content)
-                            
-                            file_size = len(download_response.content)
-                            print(f"   ✅ Downloaded: {filename} ({file_size} bytes)")
-                        else:
-                            print(f"   ❌ Failed: {download_response.status_code}")
-                
-            else:
-                print("❌ No search results found to test download")
-        else:
-            print(f"❌ Search failed: {response.status_code}")
-            print(f"Error: {response.text}")
+    # Get first resume for testing
+    first_resume = search_results['results'][0]
+    resume_id = first_resume['id']
+    resume_name = first_resume.get('name', 'Unknown')
     
-    except Exception as e:
-        print(f"❌ Test failed with error: {e}")
+    print(f"📋 Selected resume: {resume_name} (ID: {resume_id})")
+    
+    # Step 2: Test template listing
+    print("\n2. Getting available templates...")
+    template_response = get_templates()
+    if template_response.status_code == 200:
+        templates = response_json(template_response)
+        print(f"✅ Available templates: {templates.get('templates', [])}")
+        available_templates = templates.get('templates', ['professional'])
+    else:
+        print(f"⚠️  Template fetch failed: {template_response.status_code}; testing the default template only")
+        available_templates = ['professional']
+    
+    # Step 3: Test single resume download for each template
+    print(f"\n3. Testing single resume download for: {resume_name}")
+    
+    filenames = [
+        f"test_single_download_{template}_{resume_name.replace(' ', '_')}.docx"
+        for template in available_templates
+    ]
+    download_responses = _download_all([
+        (filename, {
+            'resume_id': resume_id,
+            'template': template,
+            'filename_prefix': f'SingleTest_{template}'
+        })
+        for template, filename in zip(available_templates, filenames)
+    ])
+    for template, filename, download_response in zip(available_templates, filenames, download_responses):
+        print(f"\n   Testing {template} template...")
+        assert download_response.status_code == 200, \
+            f"{template} template failed: {download_response.status_code} {download_response.text}"
+        file_size = os.path.getsize(filename)
+        print(f"   ✅ {template} template: Downloaded {filename} ({file_size} bytes)")
+        
+        # Verify it's a valid Word document
+        content_type = download_response.headers.get('content-type')
+        assert content_type == DOCX_CONTENT_TYPE, f"Unexpected content type: {content_type}"
+        print(f"   ✅ Valid Word document format")
+        
+        # Check filename in headers
+        content_disposition = download_response.headers.get('content-disposition', '')
+        assert 'attachment' in content_disposition, f"Missing download headers: {content_disposition!r}"
+        print(f"   ✅ Proper download headers set")
+    
+    # Step 4: Test with multiple resumes for comparison
+    if len(search_results['results']) > 1:
+        print(f"\n4. Testing downloads for multiple resumes...")
+        resumes = search_results['results'][:3]
+        filenames = [
+            f"test_multi_download_{i}_{resume.get('name', f'Resume_{i}').replace(' ', '_')}.docx"
+            for i, resume in enumerate(resumes, 1)
+        ]
+        download_responses = _download_all([
+            (filename, {
+                'resume_id': resume['id'],
+                'template': 'professional',
+                'filename_prefix': f'MultiTest_{i}'
+            })
+            for i, (resume, filename) in enumerate(zip(resumes, filenames), 1)
+        ])
+        for i, (resume, filename, download_response) in enumerate(zip(resumes, filenames, download_responses), 1):
+            resume_name = resume.get('name', f'Resume_{i}')
+            
+            print(f"\n   Downloading resume {i}: {resume_name}")
+            assert download_response.status_code == 200, \
+                f"Download of {resume_name} failed: {download_response.status_code}"
+            file_size = os.path.getsize(filename)
+            print(f"   ✅ Downloaded: {filename} ({file_size} bytes)")
 
 def test_error_cases():
     """Test error handling for single resume download"""
@@ -133,12 +154,10 @@ def test_error_cases():
         'filename_prefix': 'Invalid_Test'
     }
     
-    response = requests.post(f"{BASE_URL}/download_single_resume", data=invalid_data)
-    if response.status_code == 404:
-        print("✅ Correctly handled invalid resume ID (404 error)")
-    else:
-        print(f"⚠️  Unexpected response for invalid ID: {response.status_code}")
-        print(f"Response: {response.text}")
+    response = SESSION.post("/download_single_resume", data=invalid_data)
+    assert response.status_code == 404, \
+        f"Unexpected response for invalid ID: {response.status_code} {response.text}"
+    print("✅ Correctly handled invalid resume ID (404 error)")
     
     # Test with empty resume ID
     print("\n2. Testing with empty resume ID...")
@@ -148,60 +167,47 @@ def test_error_cases():
         'filename_prefix': 'Empty_Test'
     }
     
-    response = requests.post(f"{BASE_URL}/download_single_resume", data=empty_data)
-    if response.status_code == 400:
-        print("✅ Correctly handled empty resume ID (400 error)")
-    else:
-        print(f"⚠️  Unexpected response for empty ID: {response.status_code}")
-        print(f"Response: {response.text}")
+    response = SESSION.post("/download_single_resume", data=empty_data)
+    assert response.status_code == 400, \
+        f"Unexpected response for empty ID: {response.status_code} {response.text}"
+    print("✅ Correctly handled empty resume ID (400 error)")
     
     # Test with invalid template
     print("\n3. Testing with invalid template...")
-    # First get a valid resume ID
-    search_data = {'query': 'test', 'limit': 1, 'similarity_threshold': 0.1}
-    search_response = requests.post(f"{BASE_URL}/search_profile", data=search_data)
+    # First get a valid resume ID, reusing the main test's search when it already ran
+    search_response = search_profile(**SEARCH_DATA)
+    assert search_response.status_code == 200, f"Search failed: {search_response.status_code}"
+    search_results = response_json(search_response)
+    assert search_results.get('results'), "No search results found to test an invalid template"
+    resume_id = search_results['results'][0]['id']
     
-    if search_response.status_code == 200:
-        search_results = search_response.json()
-        if search_results.get('results'):
-            resume_id = search_results['results'][0]['id']
-            
-            invalid_template_data = {
-                'resume_id': resume_id,
-                'template': 'invalid_template_name',
-                'filename_prefix': 'Invalid_Template_Test'
-            }
-            
-            response = requests.post(f"{BASE_URL}/download_single_resume", data=invalid_template_data)
-            if response.status_code == 200:
-                print("✅ Invalid template handled gracefully (fallback to default)")
-            else:
-                print(f"⚠️  Unexpected response for invalid template: {response.status_code}")
+    invalid_template_data = {
+        'resume_id': resume_id,
+        'template': 'invalid_template_name',
+        'filename_prefix': 'Invalid_Template_Test'
+    }
+    
+    response = SESSION.post("/download_single_resume", data=invalid_template_data)
+    assert response.status_code == 200, f"Unexpected response for invalid template: {response.status_code}"
+    print("✅ Invalid template handled gracefully (fallback to default)")
+
+def _matching_files(pattern):
+    """DirEntry objects for the working-directory files whose names match pattern"""
+    with os.scandir('.') as entries:
+        return [entry for entry in entries if pattern.match(entry.name) and entry.is_file()]
 
 def cleanup_test_files():
     """Clean up test files"""
     print("\n\n🧹 Cleaning up test files...")
     
-    # Find all test files
-    test_files = []
-    for filename in os.listdir('.'):
-        if filename.startswith('test_single_download_') or filename.startswith('test_multi_download_'):
-            if filename.endswith('.docx'):
-                test_files.append(filename)
-    
-    for filename in test_files:
+    for entry in _matching_files(DOWNLOADED_FILE_PATTERN):
         try:
-            os.remove(filename)
-            print(f"Removed {filename}")
+            os.remove(entry.path)
+            print(f"Removed {entry.name}")
         except Exception as e:
-            print(f"Failed to remove {filename}: {e}")
+            print(f"Failed to remove {entry.name}: {e}")
 
-def show_frontend_integration_example():
-    """Show example of how to integrate with frontend"""
-    print("\n\n📋 Frontend Integration Example")
-    print("=" * 40)
-    
-    print("""
+JS_INTEGRATION_EXAMPLE = """
 // JavaScript function to download a single resume
 const downloadSingleResume = async (resumeId, resumeName, template = 'professional') => {
     try {
@@ -259,14 +265,33 @@ const downloadSingleResume = async (resumeId, resumeName, template = 'profession
 // <button onClick={() => downloadSingleResume(resume.id, resume.name, 'professional')}>
 //   Download Complete Resume
 // </button>
-    """)
+"""
+
+def show_frontend_integration_example():
+    """Show example of how to integrate with frontend"""
+    print("\n\n📋 Frontend Integration Example")
+    print("=" * 40)
+    print(JS_INTEGRATION_EXAMPLE)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Single resume download tests (light version)")
+    parser.add_argument("--yes", action="store_true", help="start without waiting for Enter")
+    parser.add_argument(
+        "--cleanup", action=argparse.BooleanOptionalAction, default=None,
+        help="delete (or with --no-cleanup keep) the generated .docx files without asking"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="send a fresh search for every test")
+    parser.add_argument("--show-js", action="store_true", help="print the frontend integration example")
+    args = parser.parse_args()
+    if args.no_cache:
+        search_profile = search_profile.__wrapped__
+    
     print("🚀 Starting Single Resume Download Tests (Light Version)")
     print("Make sure your light server is running on http://localhost:8000")
     print("And that you have some resumes uploaded and indexed")
     
-    input("\nPress Enter to continue...")
+    if not args.yes and is_interactive():
+        input("\nPress Enter to continue...")
     
     try:
         # Test main functionality
@@ -276,21 +301,27 @@ if __name__ == "__main__":
         test_error_cases()
         
         # Show integration example
-        show_frontend_integration_example()
+        if args.show_js:
+            show_frontend_integration_example()
         
         print("\n\n✅ All tests completed!")
         
         # List generated files
-        test_files = [f for f in os.listdir('.') if f.startswith('test_') and f.endswith('.docx')]
+        test_files = _matching_files(TEST_DOCUMENT_PATTERN)
         if test_files:
             print("\nGenerated files:")
-            for filename in test_files:
-                file_size = os.path.getsize(filename)
-                print(f"- {filename} ({file_size} bytes)")
+            for entry in test_files:
+                print(f"- {entry.name} ({entry.stat().st_size} bytes)")
         
-        # Ask if user wants to clean up
-        cleanup = input("\nDo you want to clean up test files? (y/n): ")
-        if cleanup.lower() == 'y':
+        # Ask if user wants to clean up, unless --cleanup/--no-cleanup decided it;
+        # unattended runs clean up
+        if args.cleanup is not None:
+            do_cleanup = args.cleanup
+        elif not is_interactive():
+            do_cleanup = True
+        else:
+            do_cleanup = input("\nDo you want to clean up test files? (y/n): ").lower() == 'y'
+        if do_cleanup:
             cleanup_test_files()
         
     except KeyboardInterrupt:
@@ -2,22 +2,28 @@
 """
 Test script for the simplified upload-only functionality (no job categories)
 """
-import requests
-import json
+import io
 import os
+import shutil
 from pathlib import Path
 
+import pytest
+
+from _test_utils import SESSION, get_health, log, pretty_json, response_json, run_concurrently
+
+# Every test here talks to the API server; skipped under pytest when it is not running
+pytestmark = pytest.mark.usefixtures("api_server")
+
 # Configuration
-BASE_URL = "http://localhost:8000"
 TEST_FILES_DIR = Path("test_files")
-
-def create_test_files():
-    """Create test files for upload testing"""
-    TEST_FILES_DIR.mkdir(exist_ok=True)
-    
-    # Create a simple text file
-    with open(TEST_FILES_DIR / "test_resume.txt", "w") as f:
-        f.write("""
+# Smoke tests in flight at once, kept low so the dev server is not swamped
+TEST_WORKERS = 4
+# Bytes of each test file by name, filled in by create_test_files()
+FILE_BLOBS = {}
+
+# Contents of each upload test file, encoded once at import
+TEST_FILE_CONTENTS = {
+    "test_resume.txt": """
 John Doe
 Software Engineer
 Email: john.doe@email.com
@@ -35,11 +41,8 @@ EDUCATION:
 
 SKILLS:
 Python, JavaScript, React, Node.js, PostgreSQL, MongoDB
-        """)
-    
-    # Create another test file
-    with open(TEST_FILES_DIR / "jane_smith_resume.txt", "w") as f:
-        f.write("""
+        """.encode(),
+    "jane_smith_resume.txt": """
 Jane Smith
 Frontend Developer
 Email: jane.smith@email.com
@@ -57,131 +60,129 @@ EDUCATION:
 
 SKILLS:
 React, Vue.js, Angular, HTML5, CSS3, JavaScript, TypeScript
-        """)
+        """.encode(),
+}
+
+def create_test_files():
+    """Create test files for upload testing"""
+    os.makedirs(TEST_FILES_DIR, exist_ok=True)
+    
+    # Files left by an earlier run are kept when they cannot be stale: same size,
+    # and written after this script (and so these contents) last changed
+    script_mtime = os.stat(__file__).st_mtime
+    for name, payload in TEST_FILE_CONTENTS.items():
+        path = TEST_FILES_DIR / name
+        try:
+            stat = os.stat(path)
+            if stat.st_size == len(payload) and stat.st_mtime >= script_mtime:
+                continue
+        except FileNotFoundError:
+            pass
+        with open(path, "wb") as f:
+            f.write(payload)
     
+    FILE_BLOBS.update(TEST_FILE_CONTENTS)
     print(f"✅ Test files created in {TEST_FILES_DIR}")
 
+def remove_test_files():
+    """Delete the test files directory"""
+    if TEST_FILES_DIR.exists():
+        shutil.rmtree(TEST_FILES_DIR)
+        print(f"🧹 Cleaned up test files from {TEST_FILES_DIR}")
+
+@pytest.fixture(scope="module", autouse=True)
+def upload_files():
+    """The test files main() creates, for pytest runs of this module"""
+    create_test_files()
+    yield
+    remove_test_files()
+
+def _upload_file(name, content_type='text/plain'):
+    """Multipart file tuple backed by the cached bytes of a test file"""
+    return (name, io.BytesIO(FILE_BLOBS[name]), content_type)
+
+def _report_endpoint(name, fetch):
+    """Call fetch(), log the status and JSON body, and fail unless it was a 200"""
+    response = fetch()
+    log(f"{name} Status: {response.status_code}")
+    log(f"Response: {pretty_json(response_json(response))}")
+    assert response.status_code == 200, f"{name} returned {response.status_code}"
+
 def test_health_check():
     """Test health check endpoint"""
-    try:
-        response = requests.get(f"{BASE_URL}/health")
-        print(f"Health Check Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        return response.status_code == 200
-    except Exception as e:
-        print(f"❌ Health check failed: {e}")
-        return False
+    _report_endpoint("Health Check", get_health)
 
 def test_root_endpoint():
     """Test root endpoint"""
-    try:
-        response = requests.get(f"{BASE_URL}/")
-        print(f"Root Endpoint Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        return response.status_code == 200
-    except Exception as e:
-        print(f"❌ Root endpoint failed: {e}")
-        return False
+    _report_endpoint("Root Endpoint", lambda: SESSION.get("/"))
 
 def test_single_file_upload():
     """Test single file upload"""
-    try:
-        files = {
-            'files': ('test_resume.txt', open(TEST_FILES_DIR / 'test_resume.txt', 'rb'), 'text/plain')
-        }
-        data = {
-            'description': 'Test single file upload'
-        }
-        
-        response = requests.post(f"{BASE_URL}/upload_profile", files=files, data=data)
-        print(f"\n📤 Single File Upload Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        
-        files['files'][1].close()  # Close file handle
-        return response.status_code == 200
-    except Exception as e:
-        print(f"❌ Single file upload failed: {e}")
-        return False
+    files = {
+        'files': _upload_file('test_resume.txt')
+    }
+    data = {
+        'description': 'Test single file upload'
+    }
+    
+    response = SESSION.post("/upload_profile", files=files, data=data)
+    log(f"\n📤 Single File Upload Status: {response.status_code}")
+    log(f"Response: {pretty_json(response_json(response))}")
+    assert response.status_code == 200, f"Single file upload returned {response.status_code}"
 
 def test_multiple_file_upload():
     """Test multiple file upload"""
-    try:
-        files = [
-            ('files', ('test_resume.txt', open(TEST_FILES_DIR / 'test_resume.txt', 'rb'), 'text/plain')),
-            ('files', ('jane_smith_resume.txt', open(TEST_FILES_DIR / 'jane_smith_resume.txt', 'rb'), 'text/plain'))
-        ]
-        data = {
-            'description': 'Test multiple file upload'
-        }
-        
-        response = requests.post(f"{BASE_URL}/upload_profile", files=files, data=data)
-        print(f"\n📤 Multiple File Upload Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        
-        # Close file handles
-        for _, (_, file_handle, _) in files:
-            file_handle.close()
-        
-        return response.status_code == 200
-    except Exception as e:
-        print(f"❌ Multiple file upload failed: {e}")
-        return False
+    files = [
+        ('files', _upload_file('test_resume.txt')),
+        ('files', _upload_file('jane_smith_resume.txt'))
+    ]
+    data = {
+        'description': 'Test multiple file upload'
+    }
+    
+    response = SESSION.post("/upload_profile", files=files, data=data)
+    log(f"\n📤 Multiple File Upload Status: {response.status_code}")
+    log(f"Response: {pretty_json(response_json(response))}")
+    assert response.status_code == 200, f"Multiple file upload returned {response.status_code}"
 
 def test_invalid_file_upload():
     """Test upload with invalid file type"""
-    try:
-        # Create an invalid file
-        invalid_file_path = TEST_FILES_DIR / "invalid_file.xyz"
-        with open(invalid_file_path, "w") as f:
-            f.write("This is an invalid file type")
-        
-        files = {
-            'files': ('invalid_file.xyz', open(invalid_file_path, 'rb'), 'application/octet-stream')
-        }
-        data = {
-            'description': 'Test invalid file upload'
-        }
-        
-        response = requests.post(f"{BASE_URL}/upload_profile", files=files, data=data)
-        print(f"\n❌ Invalid File Upload Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        
-        files['files'][1].close()  # Close file handle
-        os.unlink(invalid_file_path)  # Clean up
-        
-        # Should return 200 but with rejected files
-        return response.status_code == 200 and len(response.json().get('rejected_files', [])) > 0
-    except Exception as e:
-        print(f"❌ Invalid file upload test failed: {e}")
-        return False
+    # The invalid file never needs to touch the disk
+    files = {
+        'files': ('invalid_file.xyz', io.BytesIO(b"This is an invalid file type"), 'application/octet-stream')
+    }
+    data = {
+        'description': 'Test invalid file upload'
+    }
+    
+    response = SESSION.post("/upload_profile", files=files, data=data)
+    log(f"\n❌ Invalid File Upload Status: {response.status_code}")
+    body = response_json(response)
+    log(f"Response: {pretty_json(body)}")
+    
+    # Should return 200 but with rejected files
+    assert response.status_code == 200, f"Invalid file upload returned {response.status_code}"
+    assert body.get('rejected_files'), "The invalid file was not rejected"
 
 def test_debug_buckets():
     """Test debug buckets endpoint"""
-    try:
-        response = requests.get(f"{BASE_URL}/debug/buckets")
-        print(f"\n🔍 Debug Buckets Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        return response.status_code == 200
-    except Exception as e:
-        print(f"❌ Debug buckets failed: {e}")
-        return False
+    response = SESSION.get("/debug/buckets")
+    log(f"\n🔍 Debug Buckets Status: {response.status_code}")
+    log(f"Response: {pretty_json(response_json(response))}")
+    assert response.status_code == 200, f"Debug buckets returned {response.status_code}"
 
 def test_search_endpoint():
     """Test search endpoint (should work even without processed data)"""
-    try:
-        data = {
-            'query': 'Python developer',
-            'limit': 5,
-            'similarity_threshold': 0.5
-        }
-        
-        response = requests.post(f"{BASE_URL}/search_profile", data=data)
-        print(f"\n🔍 Search Test Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        return response.status_code == 200
-    except Exception as e:
-        print(f"❌ Search test failed: {e}")
-        return False
+    data = {
+        'query': 'Python developer',
+        'limit': 5,
+        'similarity_threshold': 0.5
+    }
+    
+    response = SESSION.post("/search_profile", data=data)
+    log(f"\n🔍 Search Test Status: {response.status_code}")
+    log(f"Response: {pretty_json(response_json(response))}")
+    assert response.status_code == 200, f"Search returned {response.status_code}"
 
 def main():
     """Run all tests"""
@@ -191,23 +192,31 @@ def main():
     # Create test files
     create_test_files()
     
-    # Run tests
-    tests = [
-        ("Root Endpoint", test_root_endpoint),
-        ("Health Check", test_health_check),
-        ("Single File Upload", test_single_file_upload),
-        ("Multiple File Upload", test_multiple_file_upload),
-        ("Invalid File Upload", test_invalid_file_upload),
-        ("Debug Buckets", test_debug_buckets),
-        ("Search Endpoint", test_search_endpoint)
+    # Run tests in stages: checks within a stage are independent and run together,
+    # but buckets and search read what the uploads stored, so they wait for them
+    stages = [
+        [
+            ("Root Endpoint", test_root_endpoint),
+            ("Health Check", test_health_check),
+            ("Invalid File Upload", test_invalid_file_upload),
+        ],
+        [
+            ("Single File Upload", test_single_file_upload),
+            ("Multiple File Upload", test_multiple_file_upload),
+        ],
+        [
+            ("Debug Buckets", test_debug_buckets),
+            ("Search Endpoint", test_search_endpoint),
+        ],
     ]
     
     results = []
-    for test_name, test_func in tests:
-        print(f"\n🧪 Running: {test_name}")
-        result = test_func()
-        results.append((test_name, result))
-        print(f"Result: {'✅ PASSED' if result else '❌ FAILED'}")
+    for tests in stages:
+        for test_name, result, lines in run_concurrently(tests, max_workers=TEST_WORKERS):
+            print(f"\n🧪 Running: {test_name}")
+            print('\n'.join(lines))
+            results.append((test_name, result))
+            print(f"Result: {'✅ PASSED' if result else '❌ FAILED'}")
     
     # Summary
     print("\n" + "=" * 60)
@@ -229,10 +238,7 @@ def main():
         print("⚠️ Some tests failed. Please check the service configuration.")
     
     # Cleanup
-    import shutil
-    if TEST_FILES_DIR.exists():
-        shutil.rmtree(TEST_FILES_DIR)
-        print(f"🧹 Cleaned up test files from {TEST_FILES_DIR}")
+    remove_test_files()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
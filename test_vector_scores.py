@@ -0,0 +1,89 @@
+"""
+Score scale of VectorService.search_resumes with and without Cross-Encoder reranking
+
+Runs against fakes for Qdrant, the BM25 model and the reranker; no server needed.
+"""
+import asyncio
+import math
+
+import numpy as np
+import pytest
+
+from services import vector_service
+from services.vector_service import VectorService
+
+
+class FakeBM25:
+    def get_scores(self, tokens):
+        return [0.0] * len(tokens)
+
+
+class FakeStorage:
+    async def load_sparse_models(self, bucket, model_file, index_file):
+        return FakeBM25(), {}
+
+
+class FakeReranker:
+    """Cross-Encoder stand-in returning fixed logits per document text"""
+
+    def __init__(self, logits):
+        self.logits = logits
+
+    def predict(self, pairs, **kwargs):
+        return np.array([self.logits[text] for _, text in pairs], dtype=np.float32)
+
+
+def _search(candidates, logits, limit=2):
+    service = VectorService(qdrant_url="http://qdrant.test")
+
+    async def create_dense_embedding(text):
+        return [0.0] * 384
+
+    async def get_reranker_model():
+        return FakeReranker(logits)
+
+    async def search_batched(request):
+        return [dict(candidate) for candidate in candidates]
+
+    async def retrieve_payloads(point_ids, selector):
+        return {point_id: {"name": f"Candidate {point_id}"} for point_id in point_ids}
+
+    service.create_dense_embedding = create_dense_embedding
+    service.get_reranker_model = get_reranker_model
+    service._search_batched = search_batched
+    service._retrieve_payloads = retrieve_payloads
+    try:
+        return asyncio.run(service.search_resumes("python developer", limit=limit, enhance_query=False))
+    finally:
+        service._rerank_pool.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def fake_storage(monkeypatch):
+    monkeypatch.setattr(vector_service, "get_storage_service", FakeStorage)
+
+
+def test_decisive_gap_keeps_vector_scores():
+    candidates = [
+        {"id": 1, "score": 0.95, "payload": {"_rerank_text": "one"}},
+        {"id": 2, "score": 0.60, "payload": {"_rerank_text": "two"}},
+    ]
+    results = _search(candidates, {"one": -4.0, "two": 6.0})
+
+    assert [r["id"] for r in results] == ["1", "2"]
+    assert [r["score_source"] for r in results] == ["vector", "vector"]
+    assert [r["similarity_score"] for r in results] == [0.95, 0.60]
+
+
+def test_reranked_scores_are_on_the_vector_scale():
+    candidates = [
+        {"id": 1, "score": 0.82, "payload": {"_rerank_text": "one"}},
+        {"id": 2, "score": 0.80, "payload": {"_rerank_text": "two"}},
+    ]
+    results = _search(candidates, {"one": -4.0, "two": 6.0})
+
+    assert [r["id"] for r in results] == ["2", "1"]
+    assert [r["score_source"] for r in results] == ["rerank", "rerank"]
+    for result, logit in zip(results, (6.0, -4.0)):
+        assert 0.0 < result["similarity_score"] < 1.0
+        assert result["similarity_score"] == pytest.approx(1.0 / (1.0 + math.exp(-logit)), rel=1e-6)